@@ -122,4 +122,138 @@ ON applications(last_updated);
 --    This index enhances the performance of join operations with the developers table.
 ----------------------------------------------------------------------
 CREATE INDEX IF NOT EXISTS idx_applications_developer_id
-ON applications(developer_id);
\ No newline at end of file
+ON applications(developer_id);
+
+----------------------------------------------------------
+-- Step 7: Create the 'load_watermarks' table
+-- One row per delta load (load_data.py --upsert): the newest scraped_time that was loaded
+-- and how many applications rows were staged, inserted and updated.
+----------------------------------------------------------
+CREATE TABLE IF NOT EXISTS load_watermarks (
+    load_id SERIAL PRIMARY KEY,                -- Load sequence number
+    loaded_at TIMESTAMP NOT NULL DEFAULT now(), -- When the load ran
+    max_scraped_time TIMESTAMP,                -- Newest scraped_time included in the load
+    rows_staged BIGINT,                        -- Rows in the loaded dataset
+    rows_inserted BIGINT,                      -- New applications
+    rows_updated BIGINT                        -- Applications whose content or scraped_time changed
+);
+
+----------------------------------------------------------
+-- Step 8: Create materialized views for the statistics endpoints
+-- The dashboard charts and the /stats/... API endpoints read these pre-aggregated
+-- views instead of scanning 'applications'. They are refreshed after every load
+-- (load_data.py) or on demand (POST /stats/refresh):
+--     REFRESH MATERIALIZED VIEW CONCURRENTLY mv_category_stats;
+-- Each view has a unique index, which REFRESH ... CONCURRENTLY requires so that
+-- readers are not blocked while a view is rebuilt.
+----------------------------------------------------------
+
+----------------------------------------------------------------------
+-- 1. Per-category totals: app count, average rating, total installs, free/paid split.
+----------------------------------------------------------------------
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_category_stats AS
+SELECT category,
+       count(*)                           AS app_count,
+       avg(rating)                        AS avg_rating,
+       sum(installs)                      AS total_installs,
+       count(*) FILTER (WHERE free)       AS free_count,
+       count(*) FILTER (WHERE NOT free)   AS paid_count
+FROM applications
+GROUP BY category;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_category_stats
+ON mv_category_stats(category);
+
+----------------------------------------------------------------------
+-- 2. Apps released per category and year.
+----------------------------------------------------------------------
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_release_trend AS
+SELECT category,
+       extract(year FROM released)::int   AS release_year,
+       count(*)                           AS app_count
+FROM applications
+WHERE released IS NOT NULL
+GROUP BY category, release_year;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_release_trend
+ON mv_release_trend(category, release_year);
+
+----------------------------------------------------------------------
+-- 3. Apps last updated per category and year.
+----------------------------------------------------------------------
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_update_trend AS
+SELECT category,
+       extract(year FROM last_updated)::int AS updated_year,
+       count(*)                             AS app_count
+FROM applications
+WHERE last_updated IS NOT NULL
+GROUP BY category, updated_year;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_update_trend
+ON mv_update_trend(category, updated_year);
+
+----------------------------------------------------------------------
+-- 4. Number of paid apps at each price (a histogram can be binned from these counts).
+----------------------------------------------------------------------
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_paid_price_counts AS
+SELECT price,
+       count(*)                           AS app_count
+FROM applications
+WHERE price > 0
+GROUP BY price;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_paid_price_counts
+ON mv_paid_price_counts(price);
+
+----------------------------------------------------------
+-- Step 9: Trigram index for fuzzy app-name search
+-- The B-tree idx_applications_app_name only serves equality and prefix lookups.
+-- A GIN index over pg_trgm trigrams serves ILIKE '%term%' substring searches and
+-- similarity matches (app_name % 'term') used by /applications/search/name.
+-- pg_trgm ships with PostgreSQL's contrib modules; where it is not installed these
+-- two statements fail and the API falls back to an in-memory trigram index
+-- (trigram_index.py).
+----------------------------------------------------------
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_applications_app_name_trgm
+ON applications USING gin (app_name gin_trgm_ops);
+
+----------------------------------------------------------
+-- Step 10: Row versions for conditional GETs (ETags)
+-- Every row carries a row_version drawn from one shared sequence. Inserts take the
+-- next value by default, and a trigger assigns a new one whenever an UPDATE actually
+-- changes the row, whoever runs it (the API, load_data.py --upsert, manual SQL).
+-- Versions are never reused, not even after a row is deleted and re-created, so the
+-- API can use them as strong ETags. Adding the column to a loaded table rewrites it once.
+----------------------------------------------------------
+CREATE SEQUENCE IF NOT EXISTS row_version_seq;
+
+ALTER TABLE categories ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT nextval('row_version_seq');
+ALTER TABLE developers ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT nextval('row_version_seq');
+ALTER TABLE applications ADD COLUMN IF NOT EXISTS row_version BIGINT NOT NULL DEFAULT nextval('row_version_seq');
+
+CREATE OR REPLACE FUNCTION bump_row_version() RETURNS trigger AS $$
+BEGIN
+    NEW.row_version := nextval('row_version_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_categories_row_version ON categories;
+CREATE TRIGGER trg_categories_row_version
+BEFORE UPDATE ON categories
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION bump_row_version();
+
+DROP TRIGGER IF EXISTS trg_developers_row_version ON developers;
+CREATE TRIGGER trg_developers_row_version
+BEFORE UPDATE ON developers
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION bump_row_version();
+
+DROP TRIGGER IF EXISTS trg_applications_row_version ON applications;
+CREATE TRIGGER trg_applications_row_version
+BEFORE UPDATE ON applications
+FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+EXECUTE FUNCTION bump_row_version();
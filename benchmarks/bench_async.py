@@ -0,0 +1,140 @@
+"""
+Side-by-side load benchmark of the sync (API.py) and async (async_api.py) services.
+
+Starts each service under uvicorn (one worker process), then drives it with N
+concurrent clients (50, 200 and 1000 by default) for a fixed duration. Every client
+loops over a mix of read endpoints: single application by id, filtered search, keyset
+page and category statistics. Reports requests/s, p50/p99 latency and errors per
+service and concurrency level, and writes them as JSON.
+
+The load generator is a single asyncio process; make sure it is not the bottleneck
+(run it on another machine or compare its CPU use with the server's) before reading
+the numbers as server limits.
+
+Needs a loaded database. Run from the repository root:
+    python -m benchmarks.bench_async --clients 50 200 1000 --duration 20
+"""
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import resource
+import subprocess
+
+import httpx
+
+SERVICES = {'sync': 'API:app', 'async': 'async_api:app'}
+
+
+def raise_file_limit():
+    """Allow as many open sockets as the hard limit permits (1000 clients need > 1024 fds)."""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+def start_server(target, port, env=None):
+    process = subprocess.Popen([sys.executable, '-m', 'uvicorn', target, '--port', str(port),
+                                '--log-level', 'warning', '--no-access-log'], env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f'http://127.0.0.1:{port}/', timeout=1).status_code == 200:
+                return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{target} did not start on port {port}")
+
+
+def request_mix(app_ids, categories):
+    """Endpoints a client cycles through, weighted towards single-row lookups."""
+    return [
+        lambda: f'/applications/{random.choice(app_ids)}',
+        lambda: f'/applications/{random.choice(app_ids)}',
+        lambda: f'/applications/search?category={random.choice(categories)}&free=false&limit=20',
+        lambda: '/applications/page?limit=50',
+        lambda: '/stats/categories',
+    ]
+
+
+async def client_loop(client, mix, stop_at, latencies, errors):
+    while time.monotonic() < stop_at:
+        url = random.choice(mix)()
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            if response.status_code >= 500:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(base_url, clients, duration, mix):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.monotonic()
+        await asyncio.gather(*(client_loop(client, mix, start + duration, latencies, errors)
+                               for _ in range(clients)))
+        elapsed = time.monotonic() - start
+    latencies.sort()
+    percentile = lambda p: round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1) \
+        if latencies else None
+    return {
+        'clients': clients,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': percentile(0.50),
+        'p99_ms': percentile(0.99),
+    }
+
+
+def sample_keys(base_url):
+    app_ids = [app['app_id'] for app in httpx.get(f'{base_url}/applications/page?limit=1000').json()['items']]
+    categories = [c['category'] for c in httpx.get(f'{base_url}/categories/?limit=1000').json()]
+    if not app_ids or not categories:
+        raise RuntimeError("The database has no applications; load data first")
+    return app_ids, categories
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async API throughput and latency.")
+    parser.add_argument('--clients', type=int, nargs='+', default=[50, 200, 1000])
+    parser.add_argument('--duration', type=float, default=20, help="Seconds per run")
+    parser.add_argument('--services', nargs='+', choices=list(SERVICES), default=list(SERVICES))
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--output', default='bench_async_results.json')
+    args = parser.parse_args()
+    raise_file_limit()
+
+    results = []
+    print(f"{'service':<8}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for offset, service in enumerate(args.services):
+        port = args.port + offset
+        server = start_server(SERVICES[service], port)
+        try:
+            base_url = f'http://127.0.0.1:{port}'
+            mix = request_mix(*sample_keys(base_url))
+            asyncio.run(run_load(base_url, 10, 2, mix))  # warm up connections and caches
+            for clients in args.clients:
+                result = dict(service=service, **asyncio.run(run_load(base_url, clients, args.duration, mix)))
+                results.append(result)
+                print(f"{service:<8}{clients:>8}{result['requests_per_second']:>10.1f}"
+                      f"{result['p50_ms'] or 0:>10.1f}{result['p99_ms'] or 0:>10.1f}{result['errors']:>8}")
+        finally:
+            server.terminate()
+            server.wait()
+
+    with open(args.output, 'w') as f:
+        json.dump({'duration': args.duration, 'results': results}, f, indent=2)
+    print(f"\nResults saved to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Load time and memory of the dashboard's data for a few sidebar filter states.
+
+Each filter state is loaded the way dashboard.py used to and the way it does now:
+  - full:   the previous query, every column of the three-way join
+            (applications, categories, developers) for every matching application;
+  - charts: every matching application, with only the columns of the chart views;
+  - table:  the first rows shown by the table view (--table-rows), with its columns.
+Time is the best of --repeat runs (query, transfer and dtype conversion); memory is
+the deep size of the resulting DataFrame with compact dtypes. The dashboard now
+loads charts + table where it loaded full.
+
+Needs a loaded database. Run from the repository root:
+    python -m benchmarks.bench_dashboard
+"""
+import json
+import time
+import argparse
+
+import pandas as pd
+from sqlalchemy import create_engine
+
+from dtype_schema import compact
+from dashboard_data import DATABASE_URL, VIEWS, applications_statement, filtered_statement, view_columns
+
+FULL_QUERY = """
+SELECT
+    a.app_id, a.app_name, a.category, a.rating, a.rating_count, a.installs, a.free, a.price,
+    a.currency, a.size, a.minimum_installs, a.maximum_installs, a.minimum_android, a.developer_id,
+    a.released AS release_date, a.last_updated, a.content_rating, a.privacy_policy AS privacy_policy_url,
+    a.ad_supported, a.in_app_purchases, a.editors_choice, a.scraped_time,
+    c.category AS category_name, d.developer_email
+FROM applications a
+JOIN categories c ON a.category = c.category
+JOIN developers d ON a.developer_id = d.developer_id
+"""
+
+FILTER_STATES = {
+    "all, free": {"free": True},
+    "Tools, free": {"categories": ["Tools"], "free": True},
+    "rating 4-5, paid": {"rating_range": (4.0, 5.0), "free": False},
+    "search 'photo'": {"free": True, "search_term": "photo"},
+}
+
+CHART_COLUMNS = view_columns(*(view for view in VIEWS if view != "table"))
+
+
+def measure(engine, statement, params, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with engine.connect() as connection:
+            df = compact(pd.read_sql(statement, connection, params=params))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, df.memory_usage(deep=True).sum() / 1024 ** 2, len(df), len(df.columns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the dashboard's data loading.")
+    parser.add_argument('--database-url', default=DATABASE_URL)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--table-rows', type=int, default=3000)
+    parser.add_argument('--output', default='bench_dashboard_results.json')
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    results = []
+    print(f"{'filters':<20}{'load':<8}{'rows':>9}{'cols':>6}{'seconds':>10}{'MB':>9}")
+    try:
+        for state, filters in FILTER_STATES.items():
+            loads = {
+                "full": filtered_statement(FULL_QUERY, **filters),
+                "charts": applications_statement(CHART_COLUMNS, **filters),
+                "table": applications_statement(view_columns("table"), limit=args.table_rows, **filters),
+            }
+            for name, (statement, params) in loads.items():
+                seconds, megabytes, rows, columns = measure(engine, statement, params, args.repeat)
+                results.append({'filters': state, 'load': name, 'rows': rows, 'columns': columns,
+                                'seconds': round(seconds, 3), 'megabytes': round(megabytes, 1)})
+                print(f"{state:<20}{name:<8}{rows:>9}{columns:>6}{seconds:>10.3f}{megabytes:>9.1f}")
+    finally:
+        engine.dispose()
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
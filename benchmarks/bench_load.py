@@ -0,0 +1,368 @@
+"""
+Load-testing harness for the API against a scratch PostgreSQL database.
+
+1. Seeding (skip with --no-seed): creates the schema (migrate.py), generates a
+   synthetic catalogue of --rows apps (generate_playstore.py), cleans it and loads it
+   with the project's own pipeline (clean_data.py, load_data.py --orchestrate). The
+   tables are TRUNCATEd first, so point --database-url at a scratch database:
+       createdb GooglePlayData_bench
+2. Load: starts the service under uvicorn on that database and drives it with N
+   concurrent clients per level (1, 10, 50 by default) for --duration seconds each.
+   Every client picks operations from a weighted mix:
+     - point reads:  application, developer and category by id;
+     - lists:        offset list, keyset pages (following next_cursor), search,
+                     category pages;
+     - writes:       rating updates, 10-row bulk upserts, create + delete.
+   Reads hit the response cache whenever the same key comes round again; writes
+   invalidate it, as in production.
+3. Report: requests, throughput, p50/p95/p99 latency and error rate per endpoint and
+   concurrency level, plus the cache hit ratio per level, printed and written as JSON.
+   --compare checks the results against an earlier file and exits with status 1 when
+   an endpoint's p95 latency grew or its throughput fell by more than --tolerance.
+
+The API relies on PostgreSQL features (ON CONFLICT upserts, materialized views), so
+there is no SQLite mode. The load generator is a single asyncio process; on small
+machines it competes with the server for CPU, so compare runs made on the same host.
+
+Run from the repository root:
+    python -m benchmarks.bench_load --database-url postgresql+psycopg2://.../GooglePlayData_bench \\
+        --rows 100k --clients 1 10 50 --duration 20 --output load_results.json
+    python -m benchmarks.bench_load --database-url ... --no-seed --compare load_results.json
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy.engine import make_url
+
+from benchmarks.bench_async import raise_file_limit, start_server
+from benchmarks.bench_pipeline import REPO_ROOT, parse_rows, run_stage, truncate_tables, git_commit
+
+SERVICES = {'sync': 'API:app', 'async': 'async_api:app'}
+BULK_ROWS = 10
+# Endpoints with fewer requests than this in either run are too noisy to compare
+MIN_COMPARE_REQUESTS = 30
+
+
+# ------------------------------------------------------------------------------
+# Seeding
+# ------------------------------------------------------------------------------
+def seed_database(database_url, rows, seed):
+    """Create the schema and load `rows` synthetic apps through the ETL pipeline."""
+    print(f"Seeding {rows:,} apps")
+    print(f"{'stage':<28}{'rows':>12}{'seconds':>10}{'peak MB':>12}{'rows/s':>14}")
+    results = [run_stage('migrate', ['migrate.py', '--database-url', database_url], rows)]
+    truncate_tables(database_url)
+    with tempfile.TemporaryDirectory(prefix='bench_load_') as tmp_dir:
+        raw = os.path.join(tmp_dir, 'Google-Playstore.csv')
+        cleaned = os.path.join(tmp_dir, 'cleaned.csv')
+        results.append(run_stage('generate', ['-m', 'benchmarks.generate_playstore', '--rows', str(rows),
+                                              '--seed', str(seed), '--output', raw], rows))
+        results.append(run_stage('clean', ['clean_data.py', '--input', raw, '--output', cleaned], rows))
+        results.append(run_stage('load', ['load_data.py', '--input', cleaned, '--database-url', database_url,
+                                          '--orchestrate'], rows))
+    failed = [result['stage'] for result in results if result['returncode'] != 0]
+    if failed:
+        raise SystemExit(f"Seeding failed at: {', '.join(failed)}")
+
+
+# ------------------------------------------------------------------------------
+# Workload
+# ------------------------------------------------------------------------------
+class Stats:
+    """Latencies and errors per endpoint for one concurrency level."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+
+    async def request(self, client, endpoint, method, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as exc:
+            self.errors[endpoint] += 1
+            self.statuses[endpoint][type(exc).__name__] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        self.statuses[endpoint][str(response.status_code)] += 1
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+
+class Workload:
+    """
+    Sample keys taken from the running service and the weighted operation mix.
+    Each operation issues one or two requests through Stats.request().
+    """
+
+    def __init__(self, apps, categories):
+        self.apps = apps
+        self.app_ids = [app['app_id'] for app in apps]
+        self.developer_ids = sorted({app['developer_id'] for app in apps})
+        self.categories = categories
+        self.operations = [
+            (self.read_application, 30),
+            (self.read_developer, 8),
+            (self.read_category, 4),
+            (self.list_applications, 6),
+            (self.page_applications, 12),
+            (self.search_applications, 14),
+            (self.page_categories, 4),
+            (self.update_application, 12),
+            (self.bulk_upsert, 5),
+            (self.create_and_delete, 5),
+        ]
+
+    def choose(self):
+        operations, weights = zip(*self.operations)
+        return random.choices(operations, weights)[0]
+
+    async def read_application(self, client, stats, state):
+        await stats.request(client, 'GET /applications/{app_id}', 'GET',
+                            f'/applications/{random.choice(self.app_ids)}')
+
+    async def read_developer(self, client, stats, state):
+        await stats.request(client, 'GET /developers/{developer_id}', 'GET',
+                            f'/developers/{random.choice(self.developer_ids)}')
+
+    async def read_category(self, client, stats, state):
+        await stats.request(client, 'GET /categories/{category_id}', 'GET',
+                            f'/categories/{random.choice(self.categories)}')
+
+    async def list_applications(self, client, stats, state):
+        await stats.request(client, 'GET /applications/', 'GET', '/applications/',
+                            params={'skip': random.randrange(0, 5000, 50), 'limit': 50})
+
+    async def page_applications(self, client, stats, state):
+        params = {'limit': 100}
+        if state.get('cursor'):
+            params['cursor'] = state['cursor']
+        response = await stats.request(client, 'GET /applications/page', 'GET', '/applications/page', params=params)
+        state['cursor'] = response.json()['next_cursor'] if response is not None else None
+
+    async def search_applications(self, client, stats, state):
+        params = {'category': random.choice(self.categories), 'min_rating': random.choice([0, 3, 4, 4.5]),
+                  'sort': random.choice(['rating', 'installs', 'released']), 'limit': 20}
+        if random.random() < 0.5:
+            params['free'] = random.random() < 0.8
+        await stats.request(client, 'GET /applications/search', 'GET', '/applications/search', params=params)
+
+    async def page_categories(self, client, stats, state):
+        await stats.request(client, 'GET /categories/page', 'GET', '/categories/page', params={'limit': 20})
+
+    async def update_application(self, client, stats, state):
+        await stats.request(client, 'PUT /applications/{app_id}', 'PUT',
+                            f'/applications/{random.choice(self.app_ids)}',
+                            json={'rating': round(random.uniform(1, 5), 1)})
+
+    async def bulk_upsert(self, client, stats, state):
+        rows = [dict(app, rating=round(random.uniform(1, 5), 1)) for app in random.sample(self.apps, BULK_ROWS)]
+        await stats.request(client, 'POST /applications/bulk', 'POST', '/applications/bulk', json=rows)
+
+    async def create_and_delete(self, client, stats, state):
+        app_id = f'bench.load.{uuid.uuid4().hex}'
+        created = await stats.request(client, 'POST /applications/', 'POST', '/applications/',
+                                      json=dict(random.choice(self.apps), app_id=app_id))
+        if created is not None:
+            await stats.request(client, 'DELETE /applications/{app_id}', 'DELETE', f'/applications/{app_id}')
+
+
+def sample_workload(base_url, samples):
+    """Pick `samples` applications spread over the table, and every category."""
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        ids, params = [], {'limit': 1000, 'fields': 'app_name'}
+        while len(ids) < samples * 20:
+            page = client.get('/applications/page', params=params).json()
+            ids.extend(app['app_id'] for app in page['items'])
+            if not page['next_cursor']:
+                break
+            params['cursor'] = page['next_cursor']
+        chosen = random.sample(ids, min(samples, len(ids)))
+        apps = []
+        for start in range(0, len(chosen), 1000):
+            apps.extend(client.get('/applications/', params={'ids': chosen[start:start + 1000]}).json())
+        categories = [c['category'] for c in client.get('/categories/', params={'limit': 1000}).json()]
+    if not apps or not categories:
+        raise RuntimeError("The database has no applications; seed it first")
+    return Workload(apps, categories)
+
+
+async def client_loop(client, workload, stats, stop_at):
+    state = {}
+    while time.monotonic() < stop_at:
+        await workload.choose()(client, stats, state)
+
+
+async def run_level(base_url, workload, clients, duration):
+    stats = Stats()
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        start = time.monotonic()
+        await asyncio.gather(*(client_loop(client, workload, stats, start + duration) for _ in range(clients)))
+        elapsed = time.monotonic() - start
+    return stats, elapsed
+
+
+# ------------------------------------------------------------------------------
+# Reporting
+# ------------------------------------------------------------------------------
+def percentile(latencies, p):
+    if not latencies:
+        return None
+    return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+
+def summarize(endpoint, latencies, errors, statuses, clients, elapsed):
+    latencies = sorted(latencies)
+    requests = len(latencies) + sum(count for status, count in statuses.items() if not status.isdigit())
+    return {
+        'clients': clients,
+        'endpoint': endpoint,
+        'requests': requests,
+        'errors': errors,
+        'error_rate': round(errors / requests, 4) if requests else None,
+        'requests_per_second': round(requests / elapsed, 1),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+        'statuses': dict(statuses),
+    }
+
+
+def level_results(stats, clients, elapsed):
+    results = [summarize(endpoint, stats.latencies[endpoint], stats.errors[endpoint], stats.statuses[endpoint],
+                         clients, elapsed)
+               for endpoint in sorted(set(stats.latencies) | set(stats.errors))]
+    statuses = defaultdict(int)
+    for endpoint_statuses in stats.statuses.values():
+        for status, count in endpoint_statuses.items():
+            statuses[status] += count
+    everything = [latency for latencies in stats.latencies.values() for latency in latencies]
+    results.append(summarize('ALL', everything, sum(stats.errors.values()), statuses, clients, elapsed))
+    return results
+
+
+def print_results(results, cache_hit_ratio):
+    for result in results:
+        print(f"{result['clients']:>7}  {result['endpoint']:<34}{result['requests']:>8}"
+              f"{result['requests_per_second']:>9.1f}{result['p50_ms'] or 0:>9.1f}{result['p95_ms'] or 0:>9.1f}"
+              f"{result['p99_ms'] or 0:>9.1f}{(result['error_rate'] or 0) * 100:>8.2f}%")
+    print(f"{'':>9}cache hit ratio: {cache_hit_ratio}\n")
+
+
+def cache_counts(base_url):
+    stats = httpx.get(f'{base_url}/cache/stats', timeout=10).json()
+    return stats['hits'], stats['misses']
+
+
+def compare(results, baseline_path, tolerance):
+    """
+    Compare p95 latency and throughput per (clients, endpoint) with a previous results
+    file. Returns the regressions beyond `tolerance` (0.2 = 20%).
+    """
+    with open(baseline_path) as f:
+        baseline = {(r['clients'], r['endpoint']): r for r in json.load(f)['results']}
+    print(f"Compared with '{baseline_path}' (p95 ratio > 1 means slower now, throughput ratio < 1 means fewer req/s):")
+    regressions = []
+    for result in results:
+        before = baseline.get((result['clients'], result['endpoint']))
+        if not before or min(before['requests'], result['requests']) < MIN_COMPARE_REQUESTS:
+            continue
+        if not before['p95_ms'] or not result['p95_ms'] or not before['requests_per_second']:
+            continue
+        latency = result['p95_ms'] / before['p95_ms']
+        throughput = result['requests_per_second'] / before['requests_per_second']
+        regressed = latency > 1 + tolerance or throughput < 1 - tolerance
+        print(f"{result['clients']:>7}  {result['endpoint']:<34}  p95 {latency:6.2f}x  throughput {throughput:6.2f}x"
+              + ("  REGRESSION" if regressed else ""))
+        if regressed:
+            regressions.append((result['clients'], result['endpoint']))
+    return regressions
+
+
+def service_environment(database_url):
+    """Environment pointing both API variants at the benchmark database."""
+    url = make_url(database_url)
+    env = dict(os.environ)
+    env['API_DATABASE_URL'] = url.set(drivername='postgresql+psycopg2').render_as_string(hide_password=False)
+    env['API_ASYNC_DATABASE_URL'] = url.set(drivername='postgresql+asyncpg').render_as_string(hide_password=False)
+    env['PYTHONPATH'] = REPO_ROOT
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API with a mix of reads and writes.")
+    parser.add_argument('--database-url', required=True, help="Scratch database (its tables are truncated)")
+    parser.add_argument('--rows', type=parse_rows, default=parse_rows('100k'), help="Apps to seed, e.g. 100k, 1M")
+    parser.add_argument('--no-seed', action='store_true', help="Reuse the data already in the database")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the synthetic data and the request mix")
+    parser.add_argument('--service', choices=list(SERVICES), default='sync')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--duration', type=float, default=20, help="Seconds per concurrency level")
+    parser.add_argument('--samples', type=int, default=2000, help="Applications the clients pick from")
+    parser.add_argument('--port', type=int, default=8300)
+    parser.add_argument('--output', default='load_results.json')
+    parser.add_argument('--compare', default=None, help="Previous results file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed p95 growth / throughput drop before --compare fails")
+    args = parser.parse_args()
+    raise_file_limit()
+    random.seed(args.seed)
+
+    if not args.no_seed:
+        seed_database(args.database_url, args.rows, args.seed)
+
+    results, cache = [], {}
+    server = start_server(SERVICES[args.service], args.port, env=service_environment(args.database_url))
+    try:
+        base_url = f'http://127.0.0.1:{args.port}'
+        workload = sample_workload(base_url, args.samples)
+        asyncio.run(run_level(base_url, workload, 2, 2))  # warm up connections
+        print(f"\n{'clients':>7}  {'endpoint':<34}{'requests':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+              f"{'p99 ms':>9}{'errors':>9}")
+        for clients in args.clients:
+            hits, misses = cache_counts(base_url)
+            stats, elapsed = asyncio.run(run_level(base_url, workload, clients, args.duration))
+            level = level_results(stats, clients, elapsed)
+            hits, misses = (new - old for new, old in zip(cache_counts(base_url), (hits, misses)))
+            cache[clients] = round(hits / (hits + misses), 4) if hits + misses else None
+            print_results(level, cache[clients])
+            results.extend(level)
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'service': args.service,
+        'rows': None if args.no_seed else args.rows,
+        'duration': args.duration,
+        'cache_hit_ratio': cache,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results saved to '{args.output}'.")
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Scaling benchmark for the parallel cleaning mode of clean_data.py.
+
+Cleans the same input with 1, 2, 4 and 8 worker processes (and the single-process
+streaming mode as a baseline), reports wall time, rows per second and speedup, and
+checks that every run produces the same output file.
+
+Run from the repository root:
+    python -m benchmarks.bench_parallel --rows 1M
+    python -m benchmarks.bench_parallel --input Google-Playstore.csv
+"""
+import os
+import time
+import filecmp
+import argparse
+import tempfile
+
+import pandas as pd
+
+from clean_data import clean_parallel, clean_streaming
+from benchmarks.generate_playstore import parse_rows, write_synthetic_csv
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel cleaning at 1/2/4/8 workers.")
+    parser.add_argument('--input', default=None, help="Raw CSV to clean (default: synthetic data)")
+    parser.add_argument('--rows', type=parse_rows, default='1M', help="Rows of synthetic data")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Chunk size of the streaming baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_path = args.input
+        if input_path is None:
+            input_path = os.path.join(tmp_dir, 'Google-Playstore.csv')
+            write_synthetic_csv(input_path, args.rows)
+        rows = sum(len(chunk) for chunk in pd.read_csv(input_path, usecols=[0], chunksize=1_000_000))
+        print(f"Input: {input_path} ({rows:,} rows, {os.path.getsize(input_path) / 1024 ** 2:.0f} MB), "
+              f"{os.cpu_count()} CPUs")
+
+        baseline_path = os.path.join(tmp_dir, 'streaming.csv')
+        baseline = timed(clean_streaming, input_path, baseline_path, args.chunksize)
+        results = [('streaming', baseline, True)]
+        for workers in args.workers:
+            output_path = os.path.join(tmp_dir, f'parallel_{workers}.csv')
+            elapsed = timed(clean_parallel, input_path, output_path, workers)
+            results.append((f'{workers} workers', elapsed, filecmp.cmp(baseline_path, output_path, shallow=False)))
+
+        print(f"\n{'mode':<12}{'seconds':>10}{'rows/s':>14}{'speedup':>10}  same output")
+        for mode, elapsed, same in results:
+            print(f"{mode:<12}{elapsed:>10.2f}{rows / elapsed:>14,.0f}{baseline / elapsed:>9.2f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
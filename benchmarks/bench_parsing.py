@@ -0,0 +1,79 @@
+"""
+Benchmark the row-wise and vectorized parsers for the Size, Installs and Price columns.
+
+Builds synthetic columns with realistic values, times both implementations and checks
+that they produce bit-identical results.
+
+Run from the repository root:
+    python -m benchmarks.bench_parsing --rows 5000000
+"""
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from clean_data import convert_size, parse_size, parse_installs, parse_price
+
+SIZE_SAMPLES = ['Varies with device', '512k', '1.5k', '999k', 'bad', '12M', '100M', '1,024k']
+INSTALL_SAMPLES = ['0+', '1+', '10+', '100+', '1,000+', '10,000+', '1,000,000+', '5,000,000,000+']
+PRICE_SAMPLES = ['$0.99', '$1.49', '$4.99', '0', '$399.99', '$0.0']
+
+
+def synthetic_sizes(rows, rng):
+    """Mix of megabyte sizes, kilobyte sizes and the special/invalid cases."""
+    fixed = rng.choice(np.array(SIZE_SAMPLES, dtype=object), rows)
+    megabytes = np.char.add(np.round(rng.uniform(1, 150, rows), 1).astype(str), 'M').astype(object)
+    return pd.Series(np.where(rng.random(rows) < 0.7, megabytes, fixed))
+
+
+def time_call(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bit_identical(a, b):
+    """Compare two float arrays bit for bit (so NaN payloads and -0.0 count too)."""
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    b = np.ascontiguousarray(b, dtype=np.float64)
+    return a.shape == b.shape and np.array_equal(a.view(np.uint64), b.view(np.uint64))
+
+
+def report(name, rows, row_wise_time, vectorized_time, identical):
+    print(f"{name:<10} row-wise {row_wise_time:8.3f}s  vectorized {vectorized_time:8.3f}s  "
+          f"speedup {row_wise_time / vectorized_time:6.1f}x  "
+          f"({rows / vectorized_time:,.0f} rows/s)  identical={identical}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Size/Installs/Price parsing.")
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+    print(f"Rows: {args.rows:,}")
+
+    sizes = synthetic_sizes(args.rows, rng)
+    expected, row_wise_time = time_call(lambda s: s.apply(convert_size), sizes)
+    actual, vectorized_time = time_call(parse_size, sizes)
+    report('Size', args.rows, row_wise_time, vectorized_time,
+           bit_identical(expected.to_numpy(dtype=np.float64), actual.to_numpy()))
+
+    installs = pd.Series(rng.choice(np.array(INSTALL_SAMPLES, dtype=object), args.rows))
+    expected, row_wise_time = time_call(
+        lambda s: s.str.replace('[+,]', '', regex=True).astype(int), installs)
+    actual, vectorized_time = time_call(parse_installs, installs)
+    report('Installs', args.rows, row_wise_time, vectorized_time,
+           np.array_equal(expected.to_numpy(), actual.to_numpy()))
+
+    prices = pd.Series(rng.choice(np.array(PRICE_SAMPLES, dtype=object), args.rows))
+    expected, row_wise_time = time_call(
+        lambda s: s.apply(lambda p: float(p.replace('$', ''))), prices)
+    actual, vectorized_time = time_call(parse_price, prices)
+    report('Price', args.rows, row_wise_time, vectorized_time,
+           bit_identical(expected.to_numpy(dtype=np.float64), actual.to_numpy()))
+
+
+if __name__ == "__main__":
+    main()
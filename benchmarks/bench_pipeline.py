@@ -0,0 +1,251 @@
+"""
+End-to-end benchmark of the ETL pipeline on synthetic data.
+
+Generates Google-Playstore.csv-shaped files (see generate_playstore.py) at each requested
+size and runs every cleaning and loading stage as its own process, recording wall time,
+peak memory and rows per second. Results are written as JSON so runs can be diffed or
+compared with --compare.
+
+Peak memory is the largest total RSS of the stage's process tree (the stage and every
+descendant, e.g. the parallel cleaning workers), sampled from /proc every
+--sample-interval seconds. Sampling can miss a short spike, so it is never reported
+below the stage's largest single process (ru_maxrss), which is exact but does not add
+up concurrent workers.
+
+The harness itself does not import pandas: Linux carries a process's peak RSS over
+fork and exec, so a large harness process would inflate every stage's measurement.
+
+Loading stages need a scratch PostgreSQL database created from GooglePlayData.sql;
+its tables are TRUNCATEd before each full load. They are skipped without --database-url.
+
+Run from the repository root:
+    python -m benchmarks.bench_pipeline --rows 100k 1M --output results.json
+    python -m benchmarks.bench_pipeline --rows 100k --database-url postgresql+psycopg2://... \\
+        --compare baseline.json
+"""
+import os
+import csv
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+from datetime import datetime, timezone
+from importlib.metadata import version
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+def parse_rows(text):
+    """Parse a row count such as '100k', '1M' or '2500000'."""
+    text = text.strip().lower().replace('_', '').replace(',', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    return int(float(text.rstrip('km')) * multiplier)
+
+
+def tree_rss(pid):
+    """Total resident memory in bytes of a process and all its descendants (Linux /proc)."""
+    children = {}
+    rss = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue  # the process exited while we looked
+        # Fields after the parenthesised command name: state, ppid, ..., rss (pages)
+        fields = stat[stat.rindex(')') + 2:].split()
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss[int(entry)] = int(fields[21]) * PAGE_SIZE
+    total = 0
+    pending = [pid]
+    while pending:
+        pid = pending.pop()
+        total += rss.get(pid, 0)
+        pending.extend(children.get(pid, ()))
+    return total
+
+
+class TreeRssSampler(threading.Thread):
+    """Record the peak of tree_rss(pid) until stop() is called."""
+
+    def __init__(self, pid, interval):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = 0
+        self._stopped = threading.Event()
+
+    def run(self):
+        while True:
+            self.peak = max(self.peak, tree_rss(self.pid))
+            if self._stopped.wait(self.interval):
+                break
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+        return self.peak
+
+
+def run_stage(name, args, rows, sample_interval=0.05):
+    """
+    Run `python <args>` from the repository root and measure it. Peak memory is the
+    sampled peak of the process tree's total RSS, and at least the ru_maxrss of the
+    reaped child, which covers its largest single process (itself or a waited-for
+    descendant) but not the sum of processes running at the same time.
+    """
+    with tempfile.TemporaryFile() as errors:
+        start = time.perf_counter()
+        process = subprocess.Popen([sys.executable] + args, cwd=REPO_ROOT,
+                                   stdout=subprocess.DEVNULL, stderr=errors)
+        sampler = TreeRssSampler(process.pid, sample_interval)
+        sampler.start()
+        _, status, usage = os.wait4(process.pid, 0)
+        seconds = time.perf_counter() - start
+        tree_peak = sampler.stop()
+        errors.seek(0)
+        stderr = errors.read().decode(errors='replace')
+    returncode = os.waitstatus_to_exitcode(status)
+    result = {
+        'stage': name,
+        'rows': rows,
+        'seconds': round(seconds, 3),
+        'peak_rss_mb': round(max(tree_peak, usage.ru_maxrss * 1024) / 1024 ** 2, 1),
+        'max_process_rss_mb': round(usage.ru_maxrss / 1024, 1),
+        'rows_per_second': round(rows / seconds),
+        'returncode': returncode,
+    }
+    print(f"{name:<28}{rows:>12,}{seconds:>10.2f}{result['peak_rss_mb']:>12.1f}"
+          f"{result['rows_per_second']:>14,}" + ('' if returncode == 0 else f"  FAILED ({returncode})"))
+    if returncode != 0:
+        result['error'] = stderr.strip().splitlines()[-1] if stderr.strip() else ''
+    return result
+
+
+def count_rows(path):
+    """Count the records of a CSV file (quoted newlines included), excluding the header."""
+    with open(path, newline='') as f:
+        return sum(1 for _ in csv.reader(f)) - 1
+
+
+def truncate_tables(database_url):
+    from sqlalchemy import create_engine, text
+    engine = create_engine(database_url)
+    with engine.begin() as connection:
+        connection.execute(text("TRUNCATE applications, developers, categories, load_watermarks"))
+    engine.dispose()
+
+
+def cleaning_stages(raw_path, tmp_dir, workers):
+    cleaned = os.path.join(tmp_dir, 'cleaned.csv')
+    return cleaned, [
+        ('clean in-memory', ['clean_data.py', '--input', raw_path, '--output', cleaned]),
+        ('clean streaming', ['clean_data.py', '--input', raw_path, '--output', cleaned,
+                             '--chunksize', '100000']),
+        (f'clean parallel ({workers} workers)', ['clean_data.py', '--input', raw_path, '--output', cleaned,
+                                                 '--workers', str(workers)]),
+        ('clean parquet', ['clean_data.py', '--input', raw_path, '--format', 'parquet',
+                           '--output', os.path.join(tmp_dir, 'cleaned.parquet'), '--chunksize', '100000']),
+    ]
+
+
+def loading_stages(cleaned, database_url):
+    base = ['load_data.py', '--input', cleaned, '--database-url', database_url]
+    return [
+        ('load copy', base + ['--method', 'copy'], True),
+        ('load orchestrated', base + ['--orchestrate'], True),
+        ('load upsert (no changes)', base + ['--upsert'], False),
+    ]
+
+
+def run_size(rows, args):
+    """Run every stage on a freshly generated file with `rows` apps."""
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench_', dir=args.tmp_dir) as tmp_dir:
+        raw_path = os.path.join(tmp_dir, 'Google-Playstore.csv')
+        print(f"\nDataset: {rows:,} apps")
+        print(f"{'stage':<28}{'rows':>12}{'seconds':>10}{'peak MB':>12}{'rows/s':>14}")
+        results.append(run_stage('generate', ['-m', 'benchmarks.generate_playstore', '--rows', str(rows),
+                                              '--seed', str(args.seed), '--output', raw_path], rows,
+                                 args.sample_interval))
+        raw_rows = count_rows(raw_path)
+
+        cleaned, stages = cleaning_stages(raw_path, tmp_dir, args.workers)
+        for name, stage_args in stages:
+            results.append(run_stage(name, stage_args, raw_rows, args.sample_interval))
+
+        if args.database_url:
+            cleaned_rows = count_rows(cleaned)
+            for name, stage_args, truncate in loading_stages(cleaned, args.database_url):
+                if truncate:
+                    truncate_tables(args.database_url)
+                results.append(run_stage(name, stage_args, cleaned_rows, args.sample_interval))
+    for result in results:
+        result['dataset_rows'] = rows
+    return results
+
+
+def compare(results, baseline_path):
+    """Print the time and memory ratio of every stage against a previous results file."""
+    with open(baseline_path) as f:
+        baseline = {(r['dataset_rows'], r['stage']): r for r in json.load(f)['results']}
+    print(f"\nCompared with '{baseline_path}' (ratio > 1 means slower / larger now):")
+    for result in results:
+        before = baseline.get((result['dataset_rows'], result['stage']))
+        if before:
+            print(f"{result['stage']:<28}{result['dataset_rows']:>12,}"
+                  f"  time {result['seconds'] / before['seconds']:6.2f}x"
+                  f"  memory {result['peak_rss_mb'] / before['peak_rss_mb']:6.2f}x")
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cleaning and loading stages.")
+    parser.add_argument('--rows', type=parse_rows, nargs='+', default=[parse_rows('100k')],
+                        help="Dataset sizes, e.g. 100k 1M 10M")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--database-url', default=None, help="Scratch database for the loading stages")
+    parser.add_argument('--tmp-dir', default=None, help="Where to put the generated files")
+    parser.add_argument('--sample-interval', type=float, default=0.05,
+                        help="Seconds between samples of a stage's process tree memory")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', default=None, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    results = []
+    for rows in args.rows:
+        results.extend(run_size(rows, args))
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'pandas': version('pandas'),
+        'cpus': os.cpu_count(),
+        'seed': args.seed,
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to '{args.output}'.")
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
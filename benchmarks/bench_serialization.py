@@ -0,0 +1,79 @@
+"""
+Microbenchmark of the application list response paths in API.py.
+
+For pages of 100, 1000 and 10000 applications it times:
+  - orm:    ORM Application objects validated through List[ApplicationOut] and
+            JSON-encoded, as FastAPI does for a response_model (the old list path);
+  - rows:   plain column tuples zipped into dicts and encoded with orjson
+            (the fast path of the list endpoints);
+  - rows/3: the fast path with fields=app_name,rating,installs.
+Fetch time (query + result rows) and build time (objects, validation, encoding) are
+reported separately, in microseconds per row; each is the best of --repeat runs.
+
+Needs a loaded database. Run from the repository root:
+    python -m benchmarks.bench_serialization
+"""
+import json
+import time
+import argparse
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from API import SessionLocal, Application, ApplicationOut, list_columns, row_dicts, dumps
+
+
+def orm_path(db, limit):
+    start = time.perf_counter()
+    apps = db.scalars(select(Application).order_by(Application.app_id).limit(limit)).all()
+    fetched = time.perf_counter()
+    adapter = TypeAdapter(List[ApplicationOut])
+    content = adapter.dump_python(adapter.validate_python(apps, from_attributes=True), mode="json")
+    body = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+    return fetched - start, time.perf_counter() - fetched, body
+
+
+def rows_path(db, limit, fields=None):
+    start = time.perf_counter()
+    rows = db.execute(select(*list_columns(fields)).order_by(Application.app_id).limit(limit)).all()
+    fetched = time.perf_counter()
+    body = dumps(row_dicts(rows))
+    return fetched - start, time.perf_counter() - fetched, body
+
+
+def best(run, repeat):
+    results = [run() for _ in range(repeat)]
+    return min(r[0] for r in results), min(r[1] for r in results), results[0][2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the list response serialization paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        print(f"{'rows':>6} {'path':<7}{'fetch us/row':>14}{'build us/row':>14}{'total us/row':>14}{'bytes/row':>11}")
+        for size in args.sizes:
+            paths = [
+                ("orm", lambda: orm_path(db, size)),
+                ("rows", lambda: rows_path(db, size)),
+                ("rows/3", lambda: rows_path(db, size, ["app_name", "rating", "installs"])),
+            ]
+            bodies = {}
+            for name, run in paths:
+                db.expunge_all()
+                fetch, build, body = best(run, args.repeat)
+                bodies[name] = body
+                print(f"{size:>6} {name:<7}{fetch / size * 1e6:>14.2f}{build / size * 1e6:>14.2f}"
+                      f"{(fetch + build) / size * 1e6:>14.2f}{len(body) / size:>11.0f}")
+            if json.loads(bodies["orm"]) != json.loads(bodies["rows"]):
+                raise SystemExit("The orm and rows paths produced different JSON")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
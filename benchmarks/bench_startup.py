@@ -0,0 +1,110 @@
+"""
+Startup benchmark of a multi-worker API deployment.
+
+For each worker count (1, 2 and 4 by default) it starts `uvicorn <target> --workers N`
+and measures:
+  - ready s:     time until every worker has logged "Application startup complete";
+  - conns:       database connections open once all workers are ready, before any
+                 request (work done at import or startup, e.g. schema introspection);
+  - first ms:    latency of the first request that needs the database, which pays
+                 for opening that worker's first pooled connection.
+The per-process import time of the target module is reported once, from a fresh
+interpreter.
+
+Compare against an older checkout with --app-dir. Needs a database with the schema
+(python migrate.py). Run from the repository root:
+    python -m benchmarks.bench_startup --workers 1 2 4
+"""
+import sys
+import json
+import time
+import queue
+import argparse
+import threading
+import subprocess
+
+import httpx
+from sqlalchemy import create_engine, text
+
+from API import DATABASE_URL
+
+OPEN_CONNECTIONS_SQL = text("SELECT count(*) FROM pg_stat_activity "
+                            "WHERE datname = current_database() AND pid <> pg_backend_pid()")
+
+
+def import_seconds(module, app_dir):
+    """Import time of `module` in a fresh interpreter (best of three)."""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    runs = [float(subprocess.run([sys.executable, '-c', code], cwd=app_dir, capture_output=True, text=True,
+                                 check=True).stdout.split()[-1]) for _ in range(3)]
+    return min(runs)
+
+
+def drain(stream, lines):
+    for line in stream:
+        lines.put((time.perf_counter(), line))
+
+
+def start_workers(target, workers, port, app_dir, timeout):
+    """Start uvicorn and return (process, seconds until every worker is ready)."""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, '-m', 'uvicorn', target, '--workers', str(workers),
+                                '--port', str(port), '--app-dir', app_dir, '--no-access-log'],
+                               stderr=subprocess.PIPE, text=True)
+    lines = queue.Queue()
+    threading.Thread(target=drain, args=(process.stderr, lines), daemon=True).start()
+    ready = 0
+    while ready < workers:
+        try:
+            seen_at, line = lines.get(timeout=max(0.0, start + timeout - time.perf_counter()))
+        except queue.Empty:
+            process.terminate()
+            raise RuntimeError(f"{target}: {ready} of {workers} workers ready after {timeout}s")
+        if 'Application startup complete' in line:
+            ready += 1
+    return process, seen_at - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure API startup time with several workers.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--target', default='API:app', help="uvicorn application (module:attribute)")
+    parser.add_argument('--app-dir', default='.', help="Directory to import the target from")
+    parser.add_argument('--database-url', default=DATABASE_URL)
+    parser.add_argument('--port', type=int, default=8200)
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--output', default='bench_startup_results.json')
+    args = parser.parse_args()
+
+    module = args.target.split(':')[0]
+    imported = import_seconds(module, args.app_dir)
+    print(f"import {module}: {imported:.2f}s per worker process\n")
+
+    engine = create_engine(args.database_url, pool_size=1)
+    results = []
+    print(f"{'workers':>8}{'ready s':>10}{'conns':>8}{'first ms':>10}")
+    try:
+        for workers in args.workers:
+            process, ready = start_workers(args.target, workers, args.port, args.app_dir, args.timeout)
+            try:
+                with engine.connect() as connection:
+                    connections = connection.execute(OPEN_CONNECTIONS_SQL).scalar()
+                start = time.perf_counter()
+                httpx.get(f'http://127.0.0.1:{args.port}/categories/?limit=1', timeout=30).raise_for_status()
+                first = (time.perf_counter() - start) * 1000
+            finally:
+                process.terminate()
+                process.wait()
+            results.append({'workers': workers, 'ready_seconds': round(ready, 2),
+                            'connections_at_ready': connections, 'first_request_ms': round(first, 1)})
+            print(f"{workers:>8}{ready:>10.2f}{connections:>8}{first:>10.1f}")
+    finally:
+        engine.dispose()
+
+    with open(args.output, 'w') as f:
+        json.dump({'target': args.target, 'import_seconds': round(imported, 2), 'results': results}, f, indent=2)
+    print(f"\nResults saved to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Check that every cleaning mode of clean_data.py produces the same dataset.
+
+Generates a synthetic raw file (see generate_playstore.py), or takes --input, and cleans
+it in memory, streaming (--chunksize) and in parallel (--workers), each to CSV and to
+Parquet. It fails (exit status 1) unless:
+  - the CSV outputs are byte-identical;
+  - every output, read back with load_data.read_cleaned(), holds the same values as the
+    in-memory CSV output;
+  - no date/time value present as text in the CSV output is lost (NaT) once parsed.
+A small, odd chunk size makes chunks start on many different rows, which is what exposes
+per-chunk differences such as an inferred date format.
+
+Run from the repository root:
+    python -m benchmarks.check_clean_outputs --rows 50k
+"""
+import os
+import sys
+import argparse
+import tempfile
+import subprocess
+
+import pandas as pd
+
+from benchmarks.bench_pipeline import parse_rows
+from dtype_schema import DATE_FORMATS, canonical_name
+from load_data import read_cleaned
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def clean(raw_path, output_path, output_format, mode_args):
+    subprocess.run([sys.executable, 'clean_data.py', '--input', raw_path, '--output', output_path,
+                    '--format', output_format] + mode_args,
+                   cwd=REPO_ROOT, stdout=subprocess.DEVNULL, check=True)
+
+
+def read_all(path, columns):
+    return read_cleaned(path, columns=columns).reset_index(drop=True)
+
+
+def lost_dates(csv_path, df):
+    """Date/time values present as text in the CSV file that parsed to NaT."""
+    text = pd.read_csv(csv_path, dtype=str)
+    return {column: int((text[column].notna() & df[column].isna()).sum())
+            for column in df.columns if canonical_name(column) in DATE_FORMATS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the outputs of the cleaning modes.")
+    parser.add_argument('--input', default=None, help="Raw dataset CSV (default: generate one)")
+    parser.add_argument('--rows', type=parse_rows, default=parse_rows('50k'), help="Rows to generate")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunksize', type=int, default=997)
+    parser.add_argument('--workers', type=int, default=3)
+    parser.add_argument('--tmp-dir', default=None, help="Where to put the generated files")
+    args = parser.parse_args()
+
+    modes = {
+        'in-memory': [],
+        'streaming': ['--chunksize', str(args.chunksize)],
+        'parallel': ['--workers', str(args.workers)],
+    }
+    failures = 0
+    with tempfile.TemporaryDirectory(prefix='check_', dir=args.tmp_dir) as tmp_dir:
+        raw_path = args.input
+        if raw_path is None:
+            raw_path = os.path.join(tmp_dir, 'Google-Playstore.csv')
+            subprocess.run([sys.executable, '-m', 'benchmarks.generate_playstore', '--rows', str(args.rows),
+                            '--seed', str(args.seed), '--output', raw_path],
+                           cwd=REPO_ROOT, stdout=subprocess.DEVNULL, check=True)
+        raw_path = os.path.abspath(raw_path)
+
+        outputs = {}
+        for mode, mode_args in modes.items():
+            for output_format in ('csv', 'parquet'):
+                path = os.path.join(tmp_dir, f'{mode}.{output_format}')
+                clean(raw_path, path, output_format, mode_args)
+                outputs[mode, output_format] = path
+
+        reference_path = outputs['in-memory', 'csv']
+        columns = list(pd.read_csv(reference_path, nrows=0).columns)
+        reference = read_all(reference_path, columns)
+        with open(reference_path, 'rb') as f:
+            reference_bytes = f.read()
+
+        lost = lost_dates(reference_path, reference)
+        ok = not any(lost.values())
+        failures += not ok
+        print(f"{'PASS' if ok else 'FAIL'}  {'dates parsed':<20} {len(reference)} rows, NaT from text: {lost}")
+
+        for (mode, output_format), path in outputs.items():
+            problems = []
+            if output_format == 'csv':
+                with open(path, 'rb') as f:
+                    if f.read() != reference_bytes:
+                        problems.append("CSV bytes differ from the in-memory output")
+            try:
+                pd.testing.assert_frame_equal(read_all(path, columns), reference, check_categorical=False)
+            except AssertionError as error:
+                problems.append(str(error).strip().splitlines()[0])
+            failures += bool(problems)
+            print(f"{'FAIL' if problems else 'PASS'}  {mode + ' ' + output_format:<20} "
+                  f"{'; '.join(problems) or 'same as in-memory csv'}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
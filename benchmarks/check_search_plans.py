@@ -0,0 +1,84 @@
+"""
+Check that the /applications/search filters are answered with index scans.
+
+Builds the search queries of API.py for a set of selective filter combinations, runs
+EXPLAIN on each and fails (exit status 1) if a plan reads 'applications' with a
+sequential scan or does not use the index the filter is meant for.
+
+Needs a database loaded with a realistic amount of data (100k+ applications): on a
+tiny table a sequential scan is the cheaper plan and PostgreSQL rightly picks it.
+Index-only scans also need an up-to-date visibility map, which only VACUUM builds:
+pass --vacuum right after a bulk load.
+
+Run from the repository root:
+    python -m benchmarks.check_search_plans --vacuum
+"""
+import sys
+import json
+import argparse
+
+from sqlalchemy import text
+
+from API import engine, SessionLocal, search_statement
+
+# (description, filters, index the plan must use)
+CASES = [
+    ("category + free, summary columns", dict(category=["Tools"], free=True, summary=True),
+     "idx_applications_category_free"),
+    ("categories + paid", dict(category=["Tools", "Education"], free=False),
+     "idx_applications_category_free"),
+    ("high rating range", dict(min_rating=4.9, max_rating=5.0, sort="installs"),
+     "idx_applications_rating"),
+    ("content rating", dict(content_rating=["Adults only 18+"], sort="app_name", descending=False),
+     "idx_applications_content_rating"),
+]
+
+
+def plan_nodes(node):
+    """Yield every node of an EXPLAIN (FORMAT JSON) plan tree."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def explain(db, statement):
+    sql = statement.compile(dialect=db.bind.dialect, compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="EXPLAIN the search endpoint's queries.")
+    parser.add_argument('--vacuum', action='store_true', help="Run VACUUM ANALYZE applications first")
+    parser.add_argument('--verbose', action='store_true', help="Print the full plans")
+    args = parser.parse_args()
+
+    if args.vacuum:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            connection.execute(text("VACUUM ANALYZE applications"))
+
+    failures = 0
+    db = SessionLocal()
+    try:
+        for description, filters, expected_index in CASES:
+            plan = explain(db, search_statement(**filters))
+            nodes = list(plan_nodes(plan))
+            scans = [f"{node['Node Type']} on {node.get('Index Name') or node.get('Relation Name')}"
+                     for node in nodes if 'Scan' in node['Node Type']]
+            seq_scan = any(node['Node Type'] == 'Seq Scan' and node.get('Relation Name') == 'applications'
+                           for node in nodes)
+            uses_index = any(node.get('Index Name') == expected_index for node in nodes)
+            ok = uses_index and not seq_scan
+            failures += not ok
+            print(f"{'PASS' if ok else 'FAIL'}  {description:<36} {', '.join(scans)}")
+            if args.verbose or not ok:
+                print(json.dumps(plan, indent=2))
+    finally:
+        db.close()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Deterministic generator for Google-Playstore.csv-shaped data.
+
+Produces the 24 columns of the Kaggle scrape with the dirty values the cleaning
+step has to handle: sizes such as "Varies with device", "512k" and "1,024k",
+install counts such as "1,000+", prices such as "$0.99", missing values in most
+columns, out-of-range ratings, quoted names with commas and newlines, and exact
+duplicate rows. The same seed and row count always give the same file.
+
+Run from the repository root:
+    python -m benchmarks.generate_playstore --rows 1M --output Google-Playstore.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.bench_pipeline import parse_rows
+
+CATEGORIES = ['Tools', 'Education', 'Entertainment', 'Music & Audio', 'Business', 'Productivity',
+              'Personalization', 'Lifestyle', 'Books & Reference', 'Health & Fitness', 'Puzzle',
+              'Shopping', 'Casual', 'Travel & Local', 'Food & Drink', 'Finance', 'Arcade', 'Sports']
+CONTENT_RATINGS = ['Everyone', 'Teen', 'Mature 17+', 'Everyone 10+', 'Adults only 18+', 'Unrated']
+CONTENT_RATING_WEIGHTS = [0.86, 0.08, 0.03, 0.02, 0.005, 0.005]
+INSTALL_BUCKETS = np.array([0, 1, 5, 10, 50, 100, 500, 1_000, 5_000, 10_000, 50_000, 100_000,
+                            500_000, 1_000_000, 5_000_000, 10_000_000, 100_000_000, 1_000_000_000])
+ANDROID_VERSIONS = ['4.1 and up', '4.4 and up', '5.0 and up', '6.0 and up', '7.0 and up',
+                    '8.0 and up', 'Varies with device']
+PRICES = ['$0.99', '$1.49', '$1.99', '$2.99', '$4.99', '$9.99', '$29.99', '$399.99']
+
+# Fraction of rows with a missing value, per column
+MISSING = {
+    'App Name': 0.0001, 'Rating': 0.01, 'Rating Count': 0.01, 'Installs': 0.0001,
+    'Minimum Installs': 0.0001, 'Currency': 0.0001, 'Size': 0.0001, 'Minimum Android': 0.003,
+    'Developer Id': 0.0001, 'Developer Website': 0.33, 'Developer Email': 0.0001,
+    'Released': 0.03, 'Privacy Policy': 0.18,
+}
+DUPLICATE_FRACTION = 0.02
+CHUNK_ROWS = 100_000
+
+
+def _format_installs(counts):
+    return pd.Series(counts).map('{:,}+'.format).to_numpy(dtype=object)
+
+
+def _sizes(rng, n):
+    """Megabyte and kilobyte sizes mixed with 'Varies with device'."""
+    megabytes = np.char.add(np.round(rng.lognormal(2.5, 1.0, n), 1).astype(str), 'M')
+    kilobytes = np.char.add(rng.integers(1, 1000, n).astype(str), 'k')
+    large_kilobytes = np.array([f'{k:,}k' for k in rng.integers(1000, 2000, n)])
+    kind = rng.random(n)
+    sizes = np.where(kind < 0.85, megabytes, np.where(kind < 0.93, kilobytes, 'Varies with device'))
+    return np.where(kind > 0.995, large_kilobytes, sizes).astype(object)
+
+
+def _dates(rng, n, start='2010-01-01', end='2021-06-15'):
+    start, end = pd.Timestamp(start).value // 10 ** 9, pd.Timestamp(end).value // 10 ** 9
+    dates = pd.to_datetime(rng.integers(start, end, n), unit='s')
+    return dates.strftime('%b %d, %Y').to_numpy(dtype=object)
+
+
+def synthetic_chunk(start, rows, seed=0):
+    """
+    Build the raw rows `start` .. `start + rows - 1` (plus their duplicates). Each chunk
+    draws from its own random stream, so a chunk does not depend on the ones before it.
+    """
+    rng = np.random.default_rng([seed, start])
+    ids = np.arange(start, start + rows)
+    developers = rng.integers(0, max(1, (start + rows) // 20), rows)
+    installs = INSTALL_BUCKETS[np.minimum(rng.geometric(0.25, rows) - 1, len(INSTALL_BUCKETS) - 1)]
+    free = rng.random(rows) < 0.98
+    rating = np.round(np.clip(rng.normal(4.0, 0.9, rows), 0, 5), 1)
+    rating[rng.random(rows) < 0.5] = 0.0  # half of the apps have no ratings yet
+    rating[rng.random(rows) < 0.001] = 5.5  # a few out-of-range values
+    rating_count = np.where(rating > 0, rng.integers(1, 10_000, rows), 0).astype(float)
+    names = np.array([f'App {i}' for i in ids], dtype=object)
+    odd = rng.random(rows)
+    names[odd < 0.05] = [f'App {i}: Notes, Lists & "Reminders"' for i in ids[odd < 0.05]]
+    names[odd > 0.999] = [f'App {i}\nSecond line' for i in ids[odd > 0.999]]
+
+    df = pd.DataFrame({
+        'App Name': names,
+        'App Id': [f'com.example.app{i}' for i in ids],
+        'Category': rng.choice(CATEGORIES, rows),
+        'Rating': rating,
+        'Rating Count': rating_count,
+        'Installs': _format_installs(installs),
+        'Minimum Installs': installs.astype(float),
+        'Maximum Installs': installs + rng.integers(0, np.maximum(installs, 1) * 4 + 1, rows),
+        'Free': free,
+        'Price': np.where(free, '0', rng.choice(PRICES, rows)).astype(object),
+        'Currency': 'USD',
+        'Size': _sizes(rng, rows),
+        'Minimum Android': rng.choice(ANDROID_VERSIONS, rows),
+        'Developer Id': [f'Developer {d}' for d in developers],
+        'Developer Website': [f'https://developer{d}.example.com' for d in developers],
+        'Developer Email': [f'contact@developer{d}.example.com' for d in developers],
+        'Released': _dates(rng, rows),
+        'Last Updated': _dates(rng, rows, start='2018-01-01'),
+        'Content Rating': rng.choice(CONTENT_RATINGS, rows, p=CONTENT_RATING_WEIGHTS),
+        'Privacy Policy': [f'https://developer{d}.example.com/privacy' for d in developers],
+        'Ad Supported': rng.random(rows) < 0.5,
+        'In App Purchases': rng.random(rows) < 0.08,
+        'Editors Choice': rng.random(rows) < 0.0003,
+        'Scraped Time': '2021-06-15 20:19:35',
+    })
+    for column, fraction in MISSING.items():
+        df[column] = df[column].astype(object)
+        df.loc[rng.random(rows) < fraction, column] = np.nan
+
+    duplicates = df.iloc[np.flatnonzero(rng.random(rows) < DUPLICATE_FRACTION)]
+    return pd.concat([df, duplicates])
+
+
+def write_synthetic_csv(path, rows, seed=0):
+    """
+    Write `rows` distinct apps (plus ~2% duplicate rows) to `path`, one chunk at a time
+    so memory stays flat at any size. Returns the number of rows written.
+    """
+    written = 0
+    for start in range(0, rows, CHUNK_ROWS):
+        df = synthetic_chunk(start, min(CHUNK_ROWS, rows - start), seed)
+        df.to_csv(path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+        written += len(df)
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Google-Playstore.csv.")
+    parser.add_argument('--rows', type=parse_rows, default='100k', help="Distinct apps, e.g. 100k, 1M, 10M")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='Google-Playstore.csv')
+    args = parser.parse_args()
+    written = write_synthetic_csv(args.output, args.rows, args.seed)
+    print(f"Wrote {written:,} rows ({args.rows:,} apps) to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import json
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+# ------------------------------------------------------------------------------
+# Response cache for the API's GET endpoints.
+#
+# Values are JSON-ready responses (dicts and lists), stored under string keys:
+#   - entity keys, e.g. "application:com.example.app", are deleted by the writes
+#     that change that row;
+#   - list keys (offset and keyset pages, searches) embed a version token of their
+#     namespace ("applications", "categories"). A write bumps the version instead of
+#     hunting down every page it could have shifted, so all lists of that table miss
+#     and the old entries age out of the LRU, while other tables' lists stay cached.
+#
+# Every invalidation also bumps a "generation" version kept by the backend (so in
+# Redis for the shared cache). A read notes the generation before it loads, and its
+# result is only stored if the generation is unchanged, checked atomically with the
+# write: a value loaded before another worker's write cannot be cached after it.
+#
+# Two backends:
+#   - MemoryCache: a bounded LRU with a TTL inside each worker process (default);
+#   - RedisCache: one cache shared by all workers (needs the `redis` package).
+# A backend's `remote` flag says whether its calls wait on the network: async_api.py
+# runs those in the threadpool so they do not block the event loop.
+# ------------------------------------------------------------------------------
+
+
+class MemoryCache:
+    """
+    Thread-safe LRU cache with a time-to-live per entry.
+    """
+    name = "memory"
+    remote = False
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value), least recently used first
+        self._versions = {}            # kept outside the LRU so a version is never evicted
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_versioned(self, key, namespace):
+        """Return (value or None, current version of `namespace`)."""
+        with self._lock:
+            return self._get(key), self._versions.get(namespace, 0)
+
+    def set(self, key, value):
+        with self._lock:
+            self._set(key, value)
+
+    def _set(self, key, value):
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def set_if_version(self, key, value, namespace, version):
+        """Store the value only if `namespace` is still at `version`."""
+        with self._lock:
+            if self._versions.get(namespace, 0) == version:
+                self._set(key, value)
+
+    def delete(self, keys):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def version(self, namespace):
+        return self._versions.get(namespace, 0)
+
+    def bump(self, namespace):
+        with self._lock:
+            self._versions[namespace] = self._versions.get(namespace, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {"backend": self.name, "entries": len(self._entries), "max_entries": self.max_entries,
+                "ttl": self.ttl, "hits": self.hits, "misses": self.misses,
+                "evictions": self.evictions, "expirations": self.expirations}
+
+
+class RedisCache:
+    """
+    Cache stored in Redis, shared by every worker. Entries expire after `ttl` seconds;
+    size is bounded by the server's maxmemory / eviction policy. Hits and misses are
+    counted per worker. Redis does not count evictions and expirations per key prefix,
+    so stats() reports the whole server's as server_evicted_keys / server_expired_keys.
+    """
+    name = "redis"
+    remote = True
+
+    # SET key value EX ttl, only if the version key still holds the expected token
+    SET_IF_VERSION = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('SET', KEYS[2], ARGV[2], 'EX', ARGV[3])
+end
+return false
+"""
+
+    def __init__(self, url, ttl=300, prefix="gpapi:"):
+        import redis  # only needed for this backend
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._set_if_version = self._redis.register_script(self.SET_IF_VERSION)
+        self.hits = self.misses = 0
+
+    def _decode(self, value):
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(value)
+
+    def get(self, key):
+        return self._decode(self._redis.get(self.prefix + key))
+
+    def get_versioned(self, key, namespace):
+        """Return (value or None, current version of `namespace`) in one round trip."""
+        value, version = self._redis.mget(self.prefix + key, f"{self.prefix}version:{namespace}")
+        return self._decode(value), version.decode() if version is not None else self.version(namespace)
+
+    def set(self, key, value):
+        self._redis.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def set_if_version(self, key, value, namespace, version):
+        """Store the value only if `namespace` is still at `version` (atomic, in Redis)."""
+        self._set_if_version(keys=[f"{self.prefix}version:{namespace}", self.prefix + key],
+                             args=[version, json.dumps(value), self.ttl])
+
+    def delete(self, keys):
+        if keys:
+            self._redis.delete(*(self.prefix + key for key in keys))
+
+    def version(self, namespace):
+        # Versions are random tokens rather than counters: if Redis evicts one, the
+        # replacement cannot collide with an older version and serve stale lists.
+        key = f"{self.prefix}version:{namespace}"
+        version = self._redis.get(key)
+        if version is None:
+            self._redis.set(key, uuid.uuid4().hex, nx=True)
+            version = self._redis.get(key)
+        return version.decode()
+
+    def bump(self, namespace):
+        self._redis.set(f"{self.prefix}version:{namespace}", uuid.uuid4().hex)
+
+    def clear(self):
+        keys = list(self._redis.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self._redis.delete(*keys)
+
+    def stats(self):
+        server = self._redis.info("stats")
+        return {"backend": self.name, "entries": None, "max_entries": None, "ttl": self.ttl,
+                "hits": self.hits, "misses": self.misses, "evictions": None, "expirations": None,
+                "server_evicted_keys": server.get("evicted_keys"),
+                "server_expired_keys": server.get("expired_keys")}
+
+
+class ResponseCache:
+    """
+    Entity and list caching with write-through invalidation on top of a backend.
+
+    A read that misses loads from the database and stores the result, unless a write
+    invalidated anything in between, in any worker sharing the backend: the stored value
+    could predate that write. Reads use lookup()/store() (or get_or_load() for
+    synchronous loaders), writes invalidate() after they commit.
+    """
+    GENERATION = "generation"  # version namespace bumped by every invalidation
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.invalidations = 0
+
+    @staticmethod
+    def entity_key(kind, key):
+        return f"{kind}:{key}"
+
+    def list_key(self, namespace, endpoint, **params):
+        return (f"{namespace}:{self.backend.version(namespace)}:{endpoint}:"
+                f"{json.dumps(params, sort_keys=True, default=str)}")
+
+    def lookup(self, key):
+        """Return (cached value or None, generation to pass to store())."""
+        return self.backend.get_versioned(key, self.GENERATION)
+
+    def store(self, key, generation, value):
+        self.backend.set_if_version(key, value, self.GENERATION, generation)
+        return value
+
+    def get_or_load(self, key, load):
+        value, generation = self.lookup(key)
+        if value is None:
+            value = self.store(key, generation, load())
+        return value
+
+    def invalidate(self, entity_keys=(), namespaces=()):
+        # The generation moves first: a store() checked before it lands ahead of the
+        # deletes below, a store() checked after it is dropped.
+        self.backend.bump(self.GENERATION)
+        self.invalidations += 1
+        self.backend.delete(list(entity_keys))
+        for namespace in namespaces:
+            self.backend.bump(namespace)
+
+    def stats(self):
+        stats = self.backend.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else None
+        stats["invalidations"] = self.invalidations
+        return stats
+
+
+def make_cache(url="memory://", max_entries=10000, ttl=300):
+    """
+    Build a ResponseCache from a URL: "memory://" for the in-process LRU, or a Redis
+    URL ("redis://localhost:6379/0") for a cache shared between workers.
+    """
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return ResponseCache(RedisCache(url, ttl))
+    if url == "memory://":
+        return ResponseCache(MemoryCache(max_entries, ttl))
+    raise ValueError(f"Unsupported cache URL: {url!r}")
@@ -1,89 +1,727 @@
-import pandas as pd
-import numpy as np
-
-# 1. Load the dataset from the CSV file
-df = pd.read_csv('Google-Playstore.csv')
-
-# Display the first 5 rows of the dataset
-print("Initial Data:")
-print(df.head())
-
-# Display dataset information (number of rows, columns, data types, non-null counts)
-print("\nDataset Info:")
-print(df.info())
-
-# 2. Drop duplicate records to ensure data integrity
-df.drop_duplicates(inplace=True)
-print("\nNumber of records after dropping duplicates:", df.shape[0])
-
-# 3. Check for missing values in each column
-print("\nMissing values per column:")
-print(df.isnull().sum())
-
-# 4. Drop rows with any missing values (this step might be adjusted as per your project needs)
-df.dropna(inplace=True)
-print("\nNumber of records after dropping rows with missing values:", df.shape[0])
-
-# 5. Clean and standardize the 'Installs' column
-# Remove commas and plus signs, then convert the column to integer
-df['Installs'] = df['Installs'].str.replace('[+,]', '', regex=True).astype(int)
-print("\nSample 'Installs' values after cleaning:")
-print(df['Installs'].head())
-
-# 6. Clean and standardize the 'Price' column
-# Check if the 'Price' column is of type object (string). If so, remove the dollar sign.
-# If it is already numeric (float), skip this cleaning step.
-if isinstance(df['Price'].iloc[0], str):
-    df['Price'] = df['Price'].str.replace('$', '', regex=True).astype(float)
-else:
-    print("\n'Price' column is already numeric. Skipping string cleaning for Price.")
-print("\nSample 'Price' values after cleaning (if applicable):")
-print(df['Price'].head())
-
-# 7. Clean and standardize the 'Size' column
-def convert_size(size):
-    """
-    Convert a size string to megabytes (MB).
-    - If the size is "Varies with device", return NaN.
-    - If the size ends with 'M', remove the 'M' and convert to float.
-    - If the size ends with 'k', remove the 'k', convert to float, and convert kilobytes to megabytes.
-    """
-    if size == "Varies with device":
-        return np.nan
-    # Check if size ends with 'M'
-    if size[-1] == 'M':
-        try:
-            return float(size[:-1])
-        except:
-            return np.nan
-    # Check if size ends with 'k'
-    if size[-1] == 'k':
-        try:
-            return float(size[:-1]) / 1024  # Convert kilobytes to megabytes (1 MB = 1024 kB)
-        except:
-            return np.nan
-    return np.nan
-
-# Apply the conversion function to the 'Size' column
-df['Size'] = df['Size'].apply(convert_size)
-print("\nSample 'Size' values after conversion:")
-print(df['Size'].head())
-
-# Replace NaN values in 'Size' with the median size
-df['Size'].fillna(df['Size'].median(), inplace=True)
-
-# 8. Validate the 'Rating' column by ensuring values are between 0 and 5
-df = df[(df['Rating'] >= 0) & (df['Rating'] <= 5)]
-print("\nNumber of records after filtering invalid ratings:", df.shape[0])
-
-# 9. Display the final cleaned dataset and its summary statistics
-print("\nCleaned Data Sample:")
-print(df.head())
-print("\nFinal Dataset Info:")
-print(df.info())
-print("\nDescriptive Statistics:")
-print(df.describe())
-
-# 10. Save the cleaned dataset to a new CSV file for future use
-df.to_csv('cleaned_googleplaystore.csv', index=False)
-print("\nCleaned dataset saved to 'cleaned_googleplaystore.csv'.")
+import io
+import os
+import shutil
+import argparse
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import numpy as np
+
+from dtype_schema import read_dtypes, parse_dates
+from fingerprints import FingerprintStore, key_hashes, content_hashes
+
+INPUT_CSV = 'Google-Playstore.csv'
+OUTPUT_CSV = 'cleaned_googleplaystore.csv'
+OUTPUT_PARQUET = 'cleaned_googleplaystore.parquet'
+
+# ------------------------------------------------------------------------------
+# Size conversion helper
+# ------------------------------------------------------------------------------
+def convert_size(size):
+    """
+    Convert a size string to megabytes (MB).
+    - If the size is "Varies with device", return NaN.
+    - If the size ends with 'M', remove the 'M' and convert to float.
+    - If the size ends with 'k', remove the 'k', convert to float, and convert kilobytes to megabytes.
+    """
+    if size == "Varies with device":
+        return np.nan
+    # Check if size ends with 'M'
+    if size[-1] == 'M':
+        try:
+            return float(size[:-1])
+        except:
+            return np.nan
+    # Check if size ends with 'k'
+    if size[-1] == 'k':
+        try:
+            return float(size[:-1]) / 1024  # Convert kilobytes to megabytes (1 MB = 1024 kB)
+        except:
+            return np.nan
+    return np.nan
+
+
+# ------------------------------------------------------------------------------
+# Vectorized parsers for the Size, Installs and Price columns
+# ------------------------------------------------------------------------------
+def _safe_float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _strings_to_float(strings):
+    """
+    Convert an array of strings to float64 using Python's float() semantics, so results
+    are bit-identical to calling float() on each value. Unparseable values become NaN.
+    """
+    values = np.asarray(strings, dtype=object)
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        # At least one malformed value: fall back to converting one by one
+        return np.fromiter((_safe_float(v) for v in values), dtype=np.float64, count=len(values))
+
+
+def _parse_distinct(values, parse, dtype):
+    """
+    Run a vectorized parser over the distinct values of a Series only, then broadcast
+    the results back with the factorized codes. Play Store columns repeat a small set of
+    strings ("Varies with device", "1,000+", "$0.99"), so this parses each one once.
+    Missing values map to NaN.
+    """
+    codes, uniques = pd.factorize(values)
+    parsed = parse(pd.Series(uniques, dtype=object)).astype(dtype)
+    if (codes < 0).any():
+        parsed = np.append(parsed, np.nan)  # codes of -1 pick this trailing NaN
+    return pd.Series(parsed[codes], index=values.index, name=values.name)
+
+
+def _size_megabytes(sizes):
+    suffix = sizes.str[-1]
+    is_mb = (suffix == 'M').to_numpy(dtype=bool)
+    is_kb = (suffix == 'k').to_numpy(dtype=bool)
+    has_unit = is_mb | is_kb
+
+    result = np.full(len(sizes), np.nan)
+    result[has_unit] = _strings_to_float(sizes.str[:-1].to_numpy()[has_unit])
+    result[is_kb] = result[is_kb] / 1024  # Convert kilobytes to megabytes (1 MB = 1024 kB)
+    return result
+
+
+def parse_size(sizes):
+    """
+    Vectorized equivalent of `sizes.apply(convert_size)`.
+    - Values ending with 'M' are megabytes.
+    - Values ending with 'k' are kilobytes and are divided by 1024.
+    - Anything else (including "Varies with device") becomes NaN.
+    """
+    return _parse_distinct(sizes, _size_megabytes, np.float64)
+
+
+def _install_count(installs):
+    digits = installs.str.replace(',', '', regex=False).str.replace('+', '', regex=False)
+    return np.asarray(digits, dtype=object).astype(np.int64)
+
+
+def parse_installs(installs):
+    """
+    Vectorized cleaning of the 'Installs' column: drop commas and plus signs ("1,000+" -> 1000).
+    """
+    return _parse_distinct(installs, _install_count, np.int64)
+
+
+def _price_amount(prices):
+    return _strings_to_float(prices.astype(str).str.replace('$', '', regex=False).to_numpy())
+
+
+def parse_price(prices):
+    """
+    Vectorized cleaning of the 'Price' column: drop the dollar sign ("$0.99" -> 0.99).
+    Numeric columns are returned unchanged.
+    """
+    if pd.api.types.is_numeric_dtype(prices):
+        return prices
+    return _parse_distinct(prices, _price_amount, np.float64)
+
+
+# ------------------------------------------------------------------------------
+# Output writers
+# ------------------------------------------------------------------------------
+class CsvSink:
+    """
+    Write cleaned chunks to a CSV file, with the header on the first chunk only.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._header = True
+
+    def write(self, df):
+        df.to_csv(self.path, mode='w' if self._header else 'a', header=self._header, index=False)
+        self._header = False
+
+    def close(self, columns=None):
+        # Nothing was written: leave a header-only file behind
+        if self._header and columns is not None:
+            pd.DataFrame(columns=columns).to_csv(self.path, index=False)
+
+
+class ParquetSink:
+    """
+    Write cleaned chunks as row groups of a single zstd-compressed Parquet file.
+    Dates are stored as timestamps, so readers get typed columns without re-parsing text.
+    """
+
+    def __init__(self, path, compression='zstd'):
+        import pyarrow  # Optional dependency, only needed for Parquet output
+
+        self.path = path
+        self.compression = compression
+        self._pa = pyarrow
+        self._writer = None
+        self._schema = None
+
+    def write(self, df):
+        import pyarrow.parquet as pq
+
+        # Same explicit formats as load_data.py uses for CSV input (see dtype_schema.py)
+        df = parse_dates(df.copy())
+        if self._writer is None:
+            schema = self._pa.Schema.from_pandas(df, preserve_index=False)
+            # Categorical columns: use 32-bit dictionary indices so later chunks with
+            # more categories than the first one still fit the file schema
+            for i, field in enumerate(schema):
+                if self._pa.types.is_dictionary(field.type):
+                    wide = self._pa.dictionary(self._pa.int32(), field.type.value_type)
+                    schema = schema.set(i, field.with_type(wide))
+            self._schema = schema
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+        table = self._pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self, columns=None):
+        if self._writer is not None:
+            self._writer.close()
+        elif columns is not None:
+            pd.DataFrame(columns=columns).to_parquet(self.path, index=False)
+
+
+def open_sink(path, output_format):
+    """
+    Return a writer for the requested output format ('csv' or 'parquet').
+    """
+    if output_format == 'csv':
+        return CsvSink(path)
+    if output_format == 'parquet':
+        return ParquetSink(path)
+    raise ValueError(f"Unsupported output format: {output_format}")
+
+
+# ------------------------------------------------------------------------------
+# In-memory cleaning (the whole dataset is loaded at once)
+# ------------------------------------------------------------------------------
+def clean_in_memory(input_path=INPUT_CSV, output_path=OUTPUT_CSV, output_format='csv'):
+    """
+    Clean the dataset in a single pass over an in-memory DataFrame.
+    Suitable for inputs that comfortably fit in RAM.
+    """
+    # 1. Load the dataset from the CSV file, with compact dtypes from the shared schema
+    columns = pd.read_csv(input_path, nrows=0).columns
+    df = pd.read_csv(input_path, dtype=read_dtypes(columns, raw=True))
+
+    # Display the first 5 rows of the dataset
+    print("Initial Data:")
+    print(df.head())
+
+    # Display dataset information (number of rows, columns, data types, non-null counts)
+    print("\nDataset Info:")
+    print(df.info())
+
+    # 2. Drop duplicate records to ensure data integrity
+    df.drop_duplicates(inplace=True)
+    print("\nNumber of records after dropping duplicates:", df.shape[0])
+
+    # 3. Check for missing values in each column
+    print("\nMissing values per column:")
+    print(df.isnull().sum())
+
+    # 4. Drop rows with any missing values (this step might be adjusted as per your project needs)
+    df.dropna(inplace=True)
+    print("\nNumber of records after dropping rows with missing values:", df.shape[0])
+
+    # 5. Clean and standardize the 'Installs' column
+    # Remove commas and plus signs, then convert the column to integer
+    df['Installs'] = parse_installs(df['Installs'])
+    print("\nSample 'Installs' values after cleaning:")
+    print(df['Installs'].head())
+
+    # 6. Clean and standardize the 'Price' column
+    # If the 'Price' column holds strings, remove the dollar sign.
+    # If it is already numeric (float), skip this cleaning step.
+    if pd.api.types.is_numeric_dtype(df['Price']):
+        print("\n'Price' column is already numeric. Skipping string cleaning for Price.")
+    df['Price'] = parse_price(df['Price'])
+    print("\nSample 'Price' values after cleaning (if applicable):")
+    print(df['Price'].head())
+
+    # 7. Clean and standardize the 'Size' column
+    df['Size'] = parse_size(df['Size'])
+    print("\nSample 'Size' values after conversion:")
+    print(df['Size'].head())
+
+    # Replace NaN values in 'Size' with the median size
+    df['Size'] = df['Size'].fillna(df['Size'].median())
+
+    # 8. Validate the 'Rating' column by ensuring values are between 0 and 5
+    df = df[(df['Rating'] >= 0) & (df['Rating'] <= 5)]
+    print("\nNumber of records after filtering invalid ratings:", df.shape[0])
+
+    # 9. Display the final cleaned dataset and its summary statistics
+    print("\nCleaned Data Sample:")
+    print(df.head())
+    print("\nFinal Dataset Info:")
+    print(df.info())
+    print("\nDescriptive Statistics:")
+    print(df.describe())
+
+    # 10. Save the cleaned dataset for future use
+    sink = open_sink(output_path, output_format)
+    sink.write(df)
+    sink.close()
+    print(f"\nCleaned dataset saved to '{output_path}'.")
+
+
+# ------------------------------------------------------------------------------
+# Streaming cleaning (bounded memory, the input is read in fixed-size chunks)
+# ------------------------------------------------------------------------------
+def merge_sorted(a, b):
+    """
+    Merge two sorted arrays into a new sorted array in O(len(a) + len(b) log len(a)),
+    without re-sorting them.
+    """
+    merged = np.empty(len(a) + len(b), dtype=a.dtype)
+    # Element i of b lands after the elements of a smaller than it and the i before it
+    b_positions = np.searchsorted(a, b) + np.arange(len(b))
+    is_a = np.ones(len(merged), dtype=bool)
+    is_a[b_positions] = False
+    merged[b_positions] = b
+    merged[is_a] = a
+    return merged
+
+
+class RowHashSet:
+    """
+    Set of 64-bit row hashes used to drop duplicates across chunks.
+
+    Memory grows by 8 bytes per distinct row instead of holding the rows themselves,
+    so it is not flat: 100 million distinct rows take 800 MB (plus the run being
+    merged). Hashes are kept in sorted runs whose sizes at least halve from one run
+    to the next; a chunk's new hashes become a run and equal-sized runs are merged,
+    like the carries of a binary counter. Each hash is therefore copied O(log chunks)
+    times in total rather than once per chunk, and a lookup searches O(log chunks)
+    runs.
+    """
+
+    def __init__(self):
+        self._runs = []  # sorted uint64 arrays, largest first
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    def contains(self, hashes):
+        """
+        Return a boolean mask that is True for the hashes already in the set.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        contained = np.zeros(len(hashes), dtype=bool)
+        # Searching in ascending order keeps the binary searches cache-friendly
+        order = np.argsort(hashes, kind='stable')
+        queries = hashes[order]
+        for run in self._runs:
+            pos = np.searchsorted(run, queries)
+            in_range = pos < len(run)
+            found = np.zeros(len(queries), dtype=bool)
+            found[in_range] = run[pos[in_range]] == queries[in_range]
+            contained[order[found]] = True
+        return contained
+
+    def add_new(self, hashes):
+        """
+        Record the given hashes and return a boolean mask that is True for the
+        first occurrence of every hash that has not been seen before.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        new = ~pd.Series(hashes).duplicated().to_numpy() & ~self.contains(hashes)
+        run = np.sort(hashes[new])
+        while self._runs and len(self._runs[-1]) <= 2 * len(run):
+            run = merge_sorted(self._runs.pop(), run)
+        if len(run):
+            self._runs.append(run)
+        return new
+
+
+def row_hashes(df):
+    """
+    Hash every row of the DataFrame (all columns, index excluded) to a 64-bit value.
+    """
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def median_from_counts(counts):
+    """
+    Compute the exact median of a multiset given as a {value: count} mapping.
+    Matches pandas' Series.median(): the mean of the two middle values for an even count.
+    """
+    if not counts:
+        return np.nan
+    values = np.array(sorted(counts), dtype=np.float64)
+    cumulative = np.cumsum([counts[v] for v in values])
+    total = cumulative[-1]
+    lower = values[np.searchsorted(cumulative, (total - 1) // 2, side='right')]
+    upper = values[np.searchsorted(cumulative, total // 2, side='right')]
+    return (lower + upper) / 2
+
+
+def clean_chunk(chunk):
+    """
+    Apply the per-row cleaning steps (missing values, Installs, Price, Size) to one chunk.
+    'Size' is left with NaN for unknown sizes; the median fill needs every chunk and
+    happens in a second pass.
+    """
+    chunk = chunk.dropna()
+    if chunk.empty:
+        return chunk
+    chunk = chunk.copy()
+    chunk['Installs'] = parse_installs(chunk['Installs'])
+    chunk['Price'] = parse_price(chunk['Price'])
+    chunk['Size'] = parse_size(chunk['Size'])
+    return chunk
+
+
+def finish_chunk(chunk, size_median):
+    """
+    Apply the steps that depend on the whole dataset: fill unknown sizes with the
+    global median and drop rows with an invalid rating.
+    """
+    chunk['Size'] = chunk['Size'].fillna(size_median)
+    return chunk[(chunk['Rating'] >= 0) & (chunk['Rating'] <= 5)]
+
+
+def clean_streaming(input_path=INPUT_CSV, output_path=OUTPUT_CSV, chunksize=100_000, output_format='csv'):
+    """
+    Clean the dataset chunk by chunk, so the rows held in memory do not depend on the
+    input size; the deduplication set still grows by 8 bytes per distinct row.
+
+    - Pass 1 reads `chunksize` rows at a time, drops rows already seen (by row hash),
+      runs the per-row cleaning steps and appends the result to a temporary file,
+      counting the distinct 'Size' values along the way.
+    - Pass 2 re-reads the temporary file in chunks, fills unknown sizes with the exact
+      median and applies the rating filter before appending to the output file.
+    """
+    seen = RowHashSet()
+    size_counts = Counter()
+    rows_read = 0
+    rows_kept = 0
+
+    # Column types come from the shared schema rather than per-chunk inference:
+    # every chunk must parse the same way, otherwise a value read as 5 in one chunk
+    # and 5.0 in another would hash differently and escape deduplication.
+    columns = pd.read_csv(input_path, nrows=0).columns
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, staging_path = tempfile.mkstemp(prefix='.clean_', suffix='.csv', dir=out_dir)
+    os.close(fd)
+    try:
+        # Pass 1: deduplicate and clean each chunk
+        staging = CsvSink(staging_path)
+        reader = pd.read_csv(input_path, chunksize=chunksize, dtype=read_dtypes(columns, raw=True))
+        for chunk in reader:
+            rows_read += len(chunk)
+            chunk = chunk[seen.add_new(row_hashes(chunk))]
+            chunk = clean_chunk(chunk)
+            if chunk.empty:
+                continue
+            size_counts.update(chunk['Size'].value_counts().to_dict())
+            staging.write(chunk)
+            rows_kept += len(chunk)
+        print(f"Rows read: {rows_read}")
+        print(f"Distinct rows: {len(seen)}")
+        print(f"Rows after dropping missing values: {rows_kept}")
+
+        size_median = median_from_counts(size_counts)
+        print(f"Median size (MB): {size_median}")
+
+        # Pass 2: fill missing sizes and validate ratings
+        rows_written = 0
+        sink = open_sink(output_path, output_format)
+        if rows_kept:
+            reader = pd.read_csv(staging_path, chunksize=chunksize, dtype=read_dtypes(columns),
+                                 float_precision='round_trip')
+            for chunk in reader:
+                chunk = finish_chunk(chunk, size_median)
+                if chunk.empty:
+                    continue
+                sink.write(chunk)
+                rows_written += len(chunk)
+        sink.close(columns=columns)
+        print(f"Number of records after filtering invalid ratings: {rows_written}")
+    finally:
+        os.remove(staging_path)
+
+    print(f"\nCleaned dataset saved to '{output_path}'.")
+
+
+# ------------------------------------------------------------------------------
+# Incremental cleaning against a persistent fingerprint store (fingerprints.py)
+# ------------------------------------------------------------------------------
+def clean_incremental(input_path=INPUT_CSV, output_path=OUTPUT_CSV, fingerprints_path='fingerprints.npz',
+                      chunksize=100_000, output_format='csv'):
+    """
+    Clean only the rows that are new or changed since the previous run and write just
+    those to the output, ready for `load_data.py --upsert`.
+
+    - Rows are identified by App Id; the first row of each App Id in the input wins.
+    - A row whose content hash matches the store is skipped without being cleaned.
+    - Unknown sizes are filled with the median over every app of this input, changed or
+      not (unchanged apps contribute their stored size), i.e. the median a full re-clean
+      of the input would use. Apps missing from the input stay in the store but do not
+      count. Rows emitted by earlier runs keep the median of their run.
+    - The store is only saved once the output has been written, so a failed run can
+      simply be repeated.
+    """
+    store = FingerprintStore.load(fingerprints_path)
+    print(f"Fingerprints: {len(store)} apps in '{fingerprints_path}'")
+    seen = RowHashSet()
+    updates = []
+    rows_read = 0
+    rows_changed = 0
+    rows_kept = 0
+
+    columns = pd.read_csv(input_path, nrows=0).columns
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, staging_path = tempfile.mkstemp(prefix='.clean_', suffix='.csv', dir=out_dir)
+    os.close(fd)
+    try:
+        # Pass 1: skip unchanged rows, clean the rest
+        staging = CsvSink(staging_path)
+        reader = pd.read_csv(input_path, chunksize=chunksize, dtype=read_dtypes(columns, raw=True))
+        for chunk in reader:
+            rows_read += len(chunk)
+            keys = key_hashes(chunk)
+            contents = content_hashes(chunk)
+            candidates = seen.add_new(keys)
+            candidates[candidates] = store.changed(keys[candidates], contents[candidates])
+            chunk = chunk[candidates]
+            rows_changed += len(chunk)
+            cleaned = clean_chunk(chunk)
+            kept = chunk.index.isin(cleaned.index)
+            sizes = np.full(len(chunk), np.nan)
+            sizes[kept] = cleaned['Size'].to_numpy(dtype=np.float64)
+            updates.append((keys[candidates], contents[candidates], sizes, kept))
+            if not cleaned.empty:
+                staging.write(cleaned)
+                rows_kept += len(cleaned)
+        print(f"Rows read: {rows_read}")
+        print(f"New or changed apps: {rows_changed} (unchanged: {len(seen) - rows_changed})")
+        print(f"Rows after dropping missing values: {rows_kept}")
+
+        if updates:
+            store.merge(*(np.concatenate(parts) for parts in zip(*updates)))
+        size_median = store.size_median(seen.contains(store.keys))
+        print(f"Median size (MB): {size_median}")
+
+        # Pass 2: fill missing sizes and validate ratings
+        rows_written = 0
+        sink = open_sink(output_path, output_format)
+        if rows_kept:
+            reader = pd.read_csv(staging_path, chunksize=chunksize, dtype=read_dtypes(columns),
+                                 float_precision='round_trip')
+            for chunk in reader:
+                chunk = finish_chunk(chunk, size_median)
+                if chunk.empty:
+                    continue
+                sink.write(chunk)
+                rows_written += len(chunk)
+        sink.close(columns=columns)
+        print(f"Number of records after filtering invalid ratings: {rows_written}")
+    finally:
+        os.remove(staging_path)
+
+    store.save(fingerprints_path)
+    print(f"\nNew and changed records saved to '{output_path}' ({len(store)} apps fingerprinted).")
+
+
+# ------------------------------------------------------------------------------
+# Parallel cleaning (byte-range partitions of the input cleaned in a process pool)
+# ------------------------------------------------------------------------------
+PARTITION_BYTES = 64 * 1024 ** 2
+
+
+def record_boundaries(path, targets, block_size=16 * 1024 ** 2):
+    """
+    For each byte offset in `targets` (ascending), find the start of the first CSV record
+    at or after it. A record ends at a newline that is outside quoted fields, i.e. one
+    preceded by an even number of quote characters in the file ('""' escapes count twice,
+    so they keep the parity).
+    """
+    boundaries = []
+    pending = list(targets)
+    quotes = 0  # quote characters before the current block
+    block_start = 0
+    with open(path, 'rb') as f:
+        while pending:
+            block = f.read(block_size)
+            if not block:
+                break
+            while pending:
+                start = max(pending[0], boundaries[-1] if boundaries else 0) - block_start
+                if start >= len(block):
+                    break
+                parity = (quotes + block.count(b'"', 0, start)) % 2
+                newline = block.find(b'\n', start)
+                while newline >= 0:
+                    parity = (parity + block.count(b'"', start, newline)) % 2
+                    if parity == 0:
+                        break
+                    start = newline + 1
+                    newline = block.find(b'\n', start)
+                if newline < 0:
+                    # No record boundary left in this block: resume at the next one
+                    pending[0] = block_start + len(block)
+                    break
+                boundaries.append(block_start + newline + 1)
+                pending.pop(0)
+            quotes += block.count(b'"')
+            block_start += len(block)
+    # Targets past the last record boundary map to the end of the file
+    return boundaries + [block_start] * len(pending)
+
+
+def partition_file(path, partitions):
+    """
+    Split the CSV file into at most `partitions` byte ranges of similar size, aligned
+    to record boundaries. The header line is excluded from the first range.
+    Returns a list of (start, end) byte offsets.
+    """
+    size = os.path.getsize(path)
+    targets = [0] + [size * i // partitions for i in range(1, partitions)]
+    offsets = sorted(set(record_boundaries(path, targets) + [size]))
+    return [(start, end) for start, end in zip(offsets, offsets[1:]) if end > start]
+
+
+def _clean_partition(task):
+    """
+    Worker for pass 1: parse one byte range, drop duplicates within it and run the
+    per-row cleaning steps. The cleaned rows are pickled to `staging_path` (exact
+    dtypes, no text round trip) and their row hashes and sizes are returned so the
+    parent can deduplicate across partitions and compute the global median.
+    """
+    path, start, end, columns, staging_path = task
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(data), header=None, names=columns, dtype=read_dtypes(columns, raw=True))
+    hashes = pd.Series(row_hashes(df), index=df.index)
+    df = df[~hashes.duplicated().to_numpy()]
+    df = clean_chunk(df)
+    df.to_pickle(staging_path)
+    return len(hashes), hashes.loc[df.index].to_numpy(), df['Size'].to_numpy(dtype=np.float64)
+
+
+def _finish_partition(task):
+    """
+    Worker for pass 2: keep the rows that survived the global deduplication, fill sizes
+    with the global median, validate ratings and write the partition's share of the output.
+    CSV parts are written without a header so the parent can concatenate them byte for byte.
+    """
+    staging_path, keep, size_median, part_path, output_format = task
+    df = pd.read_pickle(staging_path)[keep]
+    df = finish_chunk(df, size_median)
+    if output_format == 'csv':
+        df.to_csv(part_path, header=False, index=False)
+    else:
+        df.to_pickle(part_path)
+    return len(df)
+
+
+def clean_parallel(input_path=INPUT_CSV, output_path=OUTPUT_CSV, workers=os.cpu_count(),
+                   output_format='csv', partition_bytes=PARTITION_BYTES):
+    """
+    Clean the dataset with a pool of `workers` processes.
+
+    - The input is split into byte ranges aligned to record boundaries, at least one per
+      worker and none larger than `partition_bytes`, so worker memory stays bounded.
+    - Pass 1 cleans every partition in parallel. The parent then walks the partitions in
+      file order, keeping the first occurrence of each row hash across the whole file and
+      counting the surviving 'Size' values for the exact median.
+    - Pass 2 fills sizes and filters ratings in parallel; the parent stitches the parts
+      together in order, so the output matches the streaming mode.
+    """
+    columns = pd.read_csv(input_path, nrows=0).columns
+    size = os.path.getsize(input_path)
+    partitions = partition_file(input_path, max(workers, -(-size // partition_bytes)))
+    print(f"Partitions: {len(partitions)}, workers: {workers}")
+
+    out_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.TemporaryDirectory(prefix='.clean_', dir=out_dir) as tmp_dir, \
+            ProcessPoolExecutor(max_workers=workers) as pool:
+        # Pass 1: clean partitions in parallel, deduplicate globally in file order
+        staging = [os.path.join(tmp_dir, f'stage_{i}.pkl') for i in range(len(partitions))]
+        tasks = [(input_path, start, end, columns, path) for (start, end), path in zip(partitions, staging)]
+        seen = RowHashSet()
+        size_counts = Counter()
+        keep_masks = []
+        rows_read = 0
+        for partition_rows, hashes, sizes in pool.map(_clean_partition, tasks):
+            rows_read += partition_rows
+            keep = seen.add_new(hashes)
+            kept_sizes = sizes[keep]
+            size_counts.update(pd.Series(kept_sizes).value_counts().to_dict())
+            keep_masks.append(keep)
+        rows_kept = sum(int(keep.sum()) for keep in keep_masks)
+        print(f"Rows read: {rows_read}")
+        print(f"Rows after deduplication and dropping missing values: {rows_kept}")
+
+        size_median = median_from_counts(size_counts)
+        print(f"Median size (MB): {size_median}")
+
+        # Pass 2: finish partitions in parallel, then write them out in order
+        parts = [os.path.join(tmp_dir, f'part_{i}') for i in range(len(partitions))]
+        tasks = [(stage, keep, size_median, part, output_format)
+                 for stage, keep, part in zip(staging, keep_masks, parts)]
+        rows_written = sum(pool.map(_finish_partition, tasks))
+
+        if output_format == 'csv':
+            with open(output_path, 'w', newline='') as out:
+                pd.DataFrame(columns=columns).to_csv(out, index=False)
+                for part in parts:
+                    with open(part, newline='') as f:
+                        shutil.copyfileobj(f, out)
+        else:
+            sink = open_sink(output_path, output_format)
+            for part in parts:
+                df = pd.read_pickle(part)
+                if not df.empty:
+                    sink.write(df)
+            sink.close(columns=columns)
+        print(f"Number of records after filtering invalid ratings: {rows_written}")
+
+    print(f"\nCleaned dataset saved to '{output_path}'.")
+
+
+# ------------------------------------------------------------------------------
+# Command-line entry point
+# ------------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(description="Clean the Google Play Store dataset.")
+    parser.add_argument('--input', default=INPUT_CSV, help="Raw dataset CSV")
+    parser.add_argument('--output', default=None,
+                        help=f"Cleaned dataset file (default: {OUTPUT_CSV} or {OUTPUT_PARQUET})")
+    parser.add_argument('--format', dest='output_format', choices=['csv', 'parquet'], default='csv',
+                        help="Output format; Parquet keeps column types and dates")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Stream the input in chunks of this many rows; memory is bounded by the "
+                             "chunk size plus 8 bytes per distinct row for deduplication")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Clean byte-range partitions of the input in this many processes")
+    parser.add_argument('--fingerprints', default=None,
+                        help="Fingerprint store file: only clean and output new or changed apps")
+    args = parser.parse_args()
+    output = args.output or (OUTPUT_PARQUET if args.output_format == 'parquet' else OUTPUT_CSV)
+
+    if args.fingerprints:
+        clean_incremental(args.input, output, args.fingerprints, args.chunksize or 100_000, args.output_format)
+    elif args.workers:
+        clean_parallel(args.input, output, args.workers, args.output_format)
+    elif args.chunksize:
+        clean_streaming(args.input, output, args.chunksize, args.output_format)
+    else:
+        clean_in_memory(args.input, output, args.output_format)
+
+
+if __name__ == "__main__":
+    main()
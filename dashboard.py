@@ -6,67 +6,38 @@ import streamlit as st
 import plotly.express as px
 from sqlalchemy import create_engine
 
+from dashboard_data import DATABASE_URL, RATING_RANGE, filter_options, load_applications, view_columns
+
 # Set Streamlit page configuration
 st.set_page_config(page_title="Google Play Data Dashboard", layout="wide")
 
 # ------------------------------------------------------------------------------
-# Function to load data from PostgreSQL with caching
-# ------------------------------------------------------------------------------
-@st.cache_data
-def load_data():
-    # Define PostgreSQL connection parameters
-    host = '127.0.0.1'
-    dbname = 'GooglePlayData'
-    user = 'postgres'
-    password = 'Alireza1679'
-
-    # Connection string for PostgreSQL
-    connection_str = f'postgresql+psycopg2://{user}:{password}@{host}/{dbname}'
-
-    # Create a SQLAlchemy engine
-    engine = create_engine(connection_str)
-
-    # SQL Query with aliases for clarity
-    query = """
-    SELECT
-        a.app_id,
-        a.app_name,
-        a.category,
-        a.rating,
-        a.rating_count,
-        a.installs,
-        a.free,
-        a.price,
-        a.currency,
-        a.size,
-        a.minimum_installs,
-        a.maximum_installs,
-        a.minimum_android,
-        a.developer_id,
-        a.released AS release_date,
-        a.last_updated,
-        a.content_rating,
-        a.privacy_policy AS privacy_policy_url,
-        a.ad_supported,
-        a.in_app_purchases,
-        a.editors_choice,
-        a.scraped_time,
-        c.category AS category_name,
-        d.developer_email
-    FROM applications a
-    JOIN categories c ON a.category = c.category
-    JOIN developers d ON a.developer_id = d.developer_id;
-    """
-    df = pd.read_sql(query, engine)
-    return df
-
-# ------------------------------------------------------------------------------
-# Load data from database and measure query execution time
+# Database access with caching
 # ------------------------------------------------------------------------------
-load_start = time.time()
-df = load_data()
-load_time = time.time() - load_start
-st.sidebar.write(f"Data loaded in {load_time:.2f} seconds")
+@st.cache_resource
+def get_engine():
+    # One engine (and connection pool) shared by every session of the app
+    return create_engine(DATABASE_URL)
+
+@st.cache_data(ttl=600)
+def load_options():
+    # Categories and content ratings offered by the sidebar
+    return filter_options(get_engine())
+
+@st.cache_data(max_entries=16, ttl=600)
+def load_data(columns, limit, categories, rating_range, free, content_ratings, search_term):
+    # Only the columns a view uses, of the applications matching the sidebar filters,
+    # filtered by PostgreSQL (see dashboard_data.py); cached per filter state
+    return load_applications(get_engine(), columns, limit=limit, categories=categories,
+                             rating_range=rating_range, free=free, content_ratings=content_ratings,
+                             search_term=search_term)
+
+options = load_options()
+
+# Charts drawn below; each view declares its columns in dashboard_data.VIEWS
+CHART_VIEWS = ("release_trend", "update_trend", "average_rating", "price_distribution", "installs_by_category")
+# Limit displayed rows to avoid high memory usage
+TABLE_ROWS = 3000
 
 # ------------------------------------------------------------------------------
 # Sidebar Filters - User input filters for the dashboard
@@ -76,16 +47,16 @@ st.sidebar.header("Filter Options")
 # Filter by Category
 category_filter = st.sidebar.multiselect(
     "Select Categories",
-    options=df["category"].unique(),
-    default=df["category"].unique()
+    options=options["categories"],
+    default=options["categories"]
 )
 
 # Filter by Rating Range
 rating_filter = st.sidebar.slider(
     "Select Rating Range",
-    min_value=0.0,
-    max_value=5.0,
-    value=(0.0, 5.0)
+    min_value=RATING_RANGE[0],
+    max_value=RATING_RANGE[1],
+    value=RATING_RANGE
 )
 
 # Filter by Price (Free or Paid)
@@ -97,31 +68,39 @@ price_filter = st.sidebar.selectbox(
 # Filter by Content Rating
 content_rating_filter = st.sidebar.multiselect(
     "Select Content Ratings",
-    options=df["content_rating"].unique(),
-    default=df["content_rating"].unique()
+    options=options["content_ratings"],
+    default=options["content_ratings"]
 )
 
 # Advanced Search: Search for App Name
 search_term = st.sidebar.text_input("Search for App Name", "")
 
 # ------------------------------------------------------------------------------
-# Filter the DataFrame based on selected filters
+# Load the applications matching the selected filters and measure query execution time
 # ------------------------------------------------------------------------------
-filtered_df = df[
-    (df["category"].isin(category_filter)) &
-    (df["rating"] >= rating_filter[0]) &
-    (df["rating"] <= rating_filter[1]) &
-    (df["free"] == (price_filter == "Free")) &
-    (df["content_rating"].isin(content_rating_filter))
-]
-
-# Apply advanced search filter if a search term is provided
-if search_term:
-    filtered_df = filtered_df[filtered_df["app_name"].str.contains(search_term, case=False, na=False)]
+def selected(values, all_values):
+    # None (no condition) when every option is selected; a tuple keeps the cache key hashable
+    return None if set(values) == set(all_values) else tuple(sorted(values))
+
+filters = dict(
+    categories=selected(category_filter, options["categories"]),
+    rating_range=tuple(rating_filter),
+    free=price_filter == "Free",
+    content_ratings=selected(content_rating_filter, options["content_ratings"]),
+    search_term=search_term.strip()
+)
+load_start = time.time()
+# Every matching application, with the few columns the charts use
+filtered_df = load_data(view_columns(*CHART_VIEWS), None, **filters)
+# The wide table only needs the rows it shows
+table_df = load_data(view_columns("table"), TABLE_ROWS, **filters)
+load_time = time.time() - load_start
+memory = filtered_df.memory_usage(deep=True).sum() + table_df.memory_usage(deep=True).sum()
+st.sidebar.write(f"Data loaded in {load_time:.2f} seconds")
+st.sidebar.write(f"Data in memory: {memory / 1024 ** 2:.1f} MB")
 
 st.write(f"Showing {len(filtered_df)} apps after filtering")
-# Limit displayed rows to avoid high memory usage
-st.dataframe(filtered_df.head(3000))
+st.dataframe(table_df)
 
 # ------------------------------------------------------------------------------
 # Data Processing: Convert date columns to datetime and extract year
@@ -137,7 +116,7 @@ filtered_df["updated_year"] = filtered_df["last_updated"].dt.year
 st.subheader("App Release Trend Over the Years")
 selected_category_for_trend = st.selectbox(
     "Select a Category for Release Trend",
-    options=df["category"].unique(),
+    options=options["categories"],
     key="release_trend"
 )
 # Measure query execution time for release trend groupby operation
@@ -156,7 +135,7 @@ st.plotly_chart(fig_release)
 st.subheader("Last Updated Trend Over the Years")
 selected_category_for_update = st.selectbox(
     "Select a Category for Last Updated Trend",
-    options=df["category"].unique(),
+    options=options["categories"],
     key="update_trend"
 )
 update_start = time.time()
@@ -173,7 +152,7 @@ st.plotly_chart(fig_update)
 # ------------------------------------------------------------------------------
 st.subheader("Average Rating per Category")
 avg_start = time.time()
-avg_rating = filtered_df.groupby("category")["rating"].mean().reset_index()
+avg_rating = filtered_df.groupby("category", observed=True)["rating"].mean().reset_index()
 avg_time = time.time() - avg_start
 st.write(f"Average Rating query executed in {avg_time:.2f} seconds")
 fig_avg_rating = px.bar(avg_rating, x="category", y="rating",
@@ -213,7 +192,7 @@ else:
 # ------------------------------------------------------------------------------
 st.subheader("Total Installs by Category")
 installs_start = time.time()
-installs_dist = filtered_df.groupby("category")["installs"].sum().reset_index()
+installs_dist = filtered_df.groupby("category", observed=True)["installs"].sum().reset_index()
 installs_time = time.time() - installs_start
 st.write(f"Total Installs query executed in {installs_time:.2f} seconds")
 fig_installs = px.bar(installs_dist, x="category", y="installs",
@@ -0,0 +1,172 @@
+import sys
+import importlib.util
+
+import pandas as pd
+
+# ------------------------------------------------------------------------------
+# Compact column types for the Play Store app table.
+#
+# Shared by clean_data.py, load_data.py and dashboard.py so that every consumer
+# holds the data with the same, small dtypes:
+#   - low-cardinality strings become categoricals (one small code per row),
+#   - integer counts are downcast to the narrowest integer type that fits,
+#   - ratings, prices and sizes become float32 where exact float64 round trips
+#     are not needed (the dashboard),
+#   - yes/no flags become booleans instead of object columns (nullable booleans
+#     when values are missing),
+#   - dates and times become datetime64 (8 bytes per row) instead of text or
+#     datetime.date objects,
+#   - free text (ids, names, URLs) held as Python objects becomes Arrow-backed
+#     strings when pyarrow is installed; pandas 3 already reads text that way.
+#
+# Free text stays the largest part of the table: on a cleaned file most of the
+# remaining bytes are the app names, ids, URLs and e-mail addresses themselves, so
+# the whole-frame saving is well below the per-column factors of the memory report.
+#
+# Columns are identified by their database name; dataset headers such as
+# 'Content Rating' and query aliases such as 'release_date' are mapped onto it.
+# ------------------------------------------------------------------------------
+CATEGORICAL_COLUMNS = ['category', 'content_rating', 'currency', 'minimum_android', 'developer_id']
+INTEGER_COLUMNS = ['rating_count', 'installs', 'minimum_installs', 'maximum_installs']
+FLOAT_COLUMNS = ['rating', 'price', 'size']
+BOOLEAN_COLUMNS = ['free', 'ad_supported', 'in_app_purchases', 'editors_choice']
+
+# Text format of the date/time columns in the scrape ("Feb 26, 2020", "2021-06-15 20:19:35").
+# The format is explicit: a guessed one comes from the first value of each chunk, so a
+# chunk starting with "May 08, 2020" would read as '%B %d, %Y' and lose every other month.
+DATE_FORMATS = {
+    'released': '%b %d, %Y',
+    'last_updated': '%b %d, %Y',
+    'scraped_time': '%Y-%m-%d %H:%M:%S',
+}
+
+# Free-text columns, kept as strings
+TEXT_COLUMNS = ['app_id', 'app_name', 'developer_website', 'developer_email', 'privacy_policy']
+TEXT_DTYPE = 'string[pyarrow]'
+
+# Columns that are still unparsed strings in the raw scrape ("1,000+", "$0.99", "10M")
+RAW_TEXT_COLUMNS = ['installs', 'price', 'size']
+
+# Aliases used by the dashboard query
+ALIASES = {
+    'category_name': 'category',
+    'release_date': 'released',
+    'privacy_policy_url': 'privacy_policy',
+}
+
+
+def canonical_name(column):
+    """
+    Map a dataset header ('Content Rating') or query alias ('release_date') to the
+    database column name used by the schema ('content_rating', 'released').
+    """
+    name = column.strip().lower().replace(' ', '_')
+    return ALIASES.get(name, name)
+
+
+def read_dtypes(columns, raw=False, compact_floats=False):
+    """
+    Build a `dtype=` mapping for pd.read_csv() over the given column names.
+
+    - **raw**: the file is the unprocessed scrape, so Installs/Price/Size are left as text.
+    - **compact_floats**: read ratings, prices and sizes as float32 instead of float64.
+
+    Integer columns are read as nullable Int64 here; call `compact()` afterwards to
+    downcast them, since their value range is only known once the data is loaded.
+    """
+    dtypes = {}
+    for column in columns:
+        name = canonical_name(column)
+        if raw and name in RAW_TEXT_COLUMNS:
+            continue
+        if name in CATEGORICAL_COLUMNS:
+            dtypes[column] = 'category'
+        elif name in INTEGER_COLUMNS:
+            dtypes[column] = 'Int64'
+        elif name in FLOAT_COLUMNS:
+            dtypes[column] = 'float32' if compact_floats else 'float64'
+        elif name in BOOLEAN_COLUMNS:
+            dtypes[column] = 'boolean'
+    return dtypes
+
+
+def _to_datetime(values, date_format):
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    if pd.api.types.is_string_dtype(values):
+        # Text from the scrape: always the explicit format (see DATE_FORMATS)
+        return pd.to_datetime(values, format=date_format, errors='coerce')
+    # datetime.date / datetime objects, e.g. DATE columns read from PostgreSQL
+    return pd.to_datetime(values, errors='coerce')
+
+
+def parse_dates(df):
+    """
+    Convert the date/time columns to datetime64, in place: text with the formats of
+    DATE_FORMATS (values that do not match become NaT), date objects as they are.
+    Returns the same DataFrame for convenience.
+    """
+    for column in df.columns:
+        date_format = DATE_FORMATS.get(canonical_name(column))
+        if date_format is not None:
+            df[column] = _to_datetime(df[column], date_format)
+    return df
+
+
+def compact(df, compact_floats=True):
+    """
+    Convert the DataFrame's known columns to their compact dtypes, in place.
+    Returns the same DataFrame for convenience.
+
+    Pass compact_floats=False when values must round-trip exactly (e.g. when they are
+    written back to FLOAT columns in PostgreSQL).
+    """
+    arrow_strings = importlib.util.find_spec('pyarrow') is not None  # optional dependency
+    for column in df.columns:
+        name = canonical_name(column)
+        if name in CATEGORICAL_COLUMNS:
+            df[column] = df[column].astype('category')
+        elif name in INTEGER_COLUMNS:
+            # Nullable integers carry a mask byte per row, so only keep them when needed
+            values = df[column].astype('Int64' if df[column].hasnans else 'int64')
+            df[column] = pd.to_numeric(values, downcast='integer')
+        elif name in FLOAT_COLUMNS and compact_floats:
+            df[column] = df[column].astype('float32')
+        elif name in BOOLEAN_COLUMNS:
+            df[column] = df[column].astype('boolean' if df[column].hasnans else 'bool')
+        elif name in DATE_FORMATS:
+            df[column] = _to_datetime(df[column], DATE_FORMATS[name])
+        elif name in TEXT_COLUMNS and arrow_strings and df[column].dtype == object:
+            df[column] = df[column].astype(TEXT_DTYPE)
+    return df
+
+
+def memory_report(before, after):
+    """
+    Compare the per-column memory usage of two versions of the same table.
+    Returns a DataFrame with dtypes, bytes before/after and the reduction factor,
+    plus a 'TOTAL' row.
+    """
+    before_bytes = before.memory_usage(index=False, deep=True)
+    after_bytes = after.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_before': before_bytes,
+        'bytes_after': after_bytes,
+    })
+    report.loc['TOTAL'] = ['', '', before_bytes.sum(), after_bytes.sum()]
+    report['reduction'] = (report['bytes_before'] / report['bytes_after']).round(1)
+    return report
+
+
+# ------------------------------------------------------------------------------
+# Memory report for a cleaned dataset:
+#     python dtype_schema.py cleaned_googleplaystore.csv
+# ------------------------------------------------------------------------------
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else 'cleaned_googleplaystore.csv'
+    default_df = pd.read_csv(path)
+    compact_df = compact(pd.read_csv(path, dtype=read_dtypes(default_df.columns, compact_floats=True)))
+    with pd.option_context('display.width', 200, 'display.max_columns', 10, 'display.max_rows', 100):
+        print(memory_report(default_df, compact_df))
@@ -0,0 +1,114 @@
+import csv
+import datetime
+import io
+import json
+
+# ------------------------------------------------------------------------------
+# Encoders for the /applications/export stream.
+#
+# Each encoder turns batches of result rows (tuples, in column order) into bytes:
+# header() once, encode(rows) for every batch fetched from the server-side cursor,
+# footer() at the end. Nothing but the current batch is held in memory, so an export
+# runs in constant memory however many rows it has.
+# ------------------------------------------------------------------------------
+
+
+def json_default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class NdjsonEncoder:
+    """
+    One JSON object per line (newline-delimited JSON).
+    """
+    media_type = "application/x-ndjson"
+    extension = "ndjson"
+
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+
+    def header(self):
+        return b""
+
+    def encode(self, rows):
+        names = self.names
+        return "".join(json.dumps(dict(zip(names, row)), ensure_ascii=False, default=json_default) + "\n"
+                       for row in rows).encode()
+
+    def footer(self):
+        return b""
+
+
+class CsvEncoder:
+    """
+    CSV with a header row; NULLs are written as empty fields.
+    """
+    media_type = "text/csv"
+    extension = "csv"
+
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+        self._buffer = io.StringIO()
+        self._writer = csv.writer(self._buffer)
+
+    def _drain(self):
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return data
+
+    def header(self):
+        self._writer.writerow(self.names)
+        return self._drain()
+
+    def encode(self, rows):
+        self._writer.writerows(rows)
+        return self._drain()
+
+    def footer(self):
+        return b""
+
+
+class ArrowEncoder:
+    """
+    Arrow IPC stream: the schema first, then one record batch per fetched batch.
+    Read it with pyarrow.ipc.open_stream() or pandas via pyarrow.
+    """
+    media_type = "application/vnd.apache.arrow.stream"
+    extension = "arrows"
+
+    def __init__(self, columns):
+        import pyarrow  # Optional dependency, only needed for Arrow output
+
+        self._pa = pyarrow
+        arrow_types = {str: pyarrow.string(), int: pyarrow.int64(), float: pyarrow.float64(),
+                       bool: pyarrow.bool_(), datetime.date: pyarrow.date32(),
+                       datetime.datetime: pyarrow.timestamp("us")}
+        self.schema = pyarrow.schema([(name, arrow_types[python_type]) for name, python_type in columns])
+        self._sink = io.BytesIO()
+        self._writer = None
+
+    def _drain(self):
+        data = self._sink.getvalue()
+        self._sink.seek(0)
+        self._sink.truncate()
+        return data
+
+    def header(self):
+        self._writer = self._pa.ipc.new_stream(self._sink, self.schema)
+        return self._drain()
+
+    def encode(self, rows):
+        values = list(zip(*rows))
+        arrays = [self._pa.array(column, type=field.type) for column, field in zip(values, self.schema)]
+        self._writer.write_batch(self._pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self._drain()
+
+    def footer(self):
+        self._writer.close()
+        return self._drain()
+
+
+EXPORT_ENCODERS = {"ndjson": NdjsonEncoder, "csv": CsvEncoder, "arrow": ArrowEncoder}
@@ -0,0 +1,120 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# ------------------------------------------------------------------------------
+# Persistent row fingerprints for incremental re-cleaning.
+#
+# For every app seen by a previous run the store keeps, in four parallel NumPy
+# arrays sorted by key:
+#   - key:     64-bit hash of the App Id,
+#   - content: 64-bit hash of the raw row as scraped,
+#   - size:    the cleaned 'Size' in MB (NaN when unknown),
+#   - kept:    whether the row survived the missing-value filter.
+# That is 25 bytes per app on disk and in memory. Lookups are a binary search
+# over the key array, so a whole chunk is checked with one np.searchsorted call.
+#
+# 'Scraped Time' changes on every scrape without the app changing, so it is left
+# out of the content hash.
+# ------------------------------------------------------------------------------
+FORMAT_VERSION = 1
+KEY_COLUMN = 'App Id'
+VOLATILE_COLUMNS = ['Scraped Time']
+
+
+def key_hashes(df):
+    """
+    Hash the App Id of every row to a 64-bit key.
+    """
+    return pd.util.hash_pandas_object(df[KEY_COLUMN], index=False).to_numpy()
+
+
+def content_hashes(df):
+    """
+    Hash every raw row (index and volatile columns excluded) to a 64-bit value.
+    """
+    columns = [column for column in df.columns if column not in VOLATILE_COLUMNS]
+    return pd.util.hash_pandas_object(df[columns], index=False).to_numpy()
+
+
+class FingerprintStore:
+    """
+    Sorted on-disk table of App Id hash -> (content hash, cleaned size, kept flag).
+    """
+
+    def __init__(self, keys=None, contents=None, sizes=None, kept=None):
+        self.keys = np.empty(0, dtype=np.uint64) if keys is None else keys
+        self.contents = np.empty(0, dtype=np.uint64) if contents is None else contents
+        self.sizes = np.empty(0, dtype=np.float64) if sizes is None else sizes
+        self.kept = np.empty(0, dtype=bool) if kept is None else kept
+
+    def __len__(self):
+        return len(self.keys)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a store written by save(). A missing file gives an empty store (first run).
+        """
+        if not os.path.exists(path):
+            return cls()
+        with np.load(path) as data:
+            if int(data['version']) != FORMAT_VERSION:
+                raise ValueError(f"Unsupported fingerprint store version in '{path}'")
+            return cls(data['keys'], data['contents'], data['sizes'], data['kept'])
+
+    def save(self, path):
+        """
+        Write the store atomically: a crash mid-write leaves the previous file intact.
+        """
+        out_dir = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.fingerprints_', suffix='.npz', dir=out_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, version=FORMAT_VERSION, keys=self.keys, contents=self.contents,
+                         sizes=self.sizes, kept=self.kept)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def changed(self, keys, contents):
+        """
+        Return a boolean mask that is True for rows whose key is not in the store
+        or whose content hash differs from the stored one.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        pos = np.searchsorted(self.keys, keys)
+        found = np.zeros(len(keys), dtype=bool)
+        in_range = pos < len(self.keys)
+        found[in_range] = self.keys[pos[in_range]] == keys[in_range]
+        same = np.zeros(len(keys), dtype=bool)
+        same[found] = self.contents[pos[found]] == np.asarray(contents, dtype=np.uint64)[found]
+        return ~same
+
+    def merge(self, keys, contents, sizes, kept):
+        """
+        Insert new keys and overwrite existing ones with the given entries.
+        `keys` must not contain duplicates.
+        """
+        keys = np.asarray(keys, dtype=np.uint64)
+        stale = np.isin(self.keys, keys)
+        order = np.argsort(np.concatenate([self.keys[~stale], keys]), kind='stable')
+        self.keys = np.concatenate([self.keys[~stale], keys])[order]
+        self.contents = np.concatenate([self.contents[~stale], np.asarray(contents, dtype=np.uint64)])[order]
+        self.sizes = np.concatenate([self.sizes[~stale], np.asarray(sizes, dtype=np.float64)])[order]
+        self.kept = np.concatenate([self.kept[~stale], np.asarray(kept, dtype=bool)])[order]
+
+    def size_median(self, current=None):
+        """
+        Median of the known sizes over the kept apps. Entries are never removed, so by
+        default this covers every app ever seen; `current` (a boolean mask over the
+        store's entries) restricts it, e.g. to the apps of the input being cleaned.
+        """
+        selected = self.kept if current is None else self.kept & current
+        sizes = self.sizes[selected]
+        sizes = sizes[~np.isnan(sizes)]
+        return float(np.median(sizes)) if len(sizes) else np.nan
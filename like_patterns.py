@@ -0,0 +1,20 @@
+# ------------------------------------------------------------------------------
+# LIKE / ILIKE patterns built from user input. Shared by API.py (fuzzy name search)
+# and dashboard_data.py (the sidebar's name search), so both match '%' and '_' in
+# a search term literally. The SQL must not override the default escape character
+# (backslash).
+# ------------------------------------------------------------------------------
+
+
+def escape_like(value):
+    """
+    Escape LIKE wildcards so the value matches literally.
+    """
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def contains_pattern(value):
+    """
+    Pattern matching any text that contains `value` (use with LIKE or ILIKE).
+    """
+    return f"%{escape_like(value)}%"
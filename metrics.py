@@ -0,0 +1,300 @@
+import bisect
+import functools
+import logging
+import re
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# ------------------------------------------------------------------------------
+# Request and database instrumentation, exposed in the Prometheus text format.
+#
+#   - http_request_duration_seconds   per method, route template and status
+#     (MetricsMiddleware);
+#   - db_statement_duration_seconds   per statement kind ("SELECT applications"),
+#     db_statement_rows_total         rows returned or affected
+#     (SQLAlchemy cursor events, see instrument_engine());
+#   - db_pool_checkout_wait_seconds   time spent waiting for a pooled connection,
+#     db_pool_checkout_timeouts_total and the db_pool_* gauges (checked out
+#     connections, pool size, overflow, saturation) read when /metrics is scraped.
+#
+# Metrics live in the worker process: with several uvicorn workers each one reports
+# its own counts, so scrape them individually.
+#
+# The slow-query log (instrument_engine(slow_query_seconds=...)) logs every statement
+# slower than the threshold; for SELECTs it also runs EXPLAIN ANALYZE on the same
+# connection and logs the plan. The re-run is read-only and inside a savepoint that is
+# rolled back, so it cannot write, call nextval() again or abort the request's
+# transaction when it fails. Statements on server-side cursors (streamed exports) are
+# skipped: their measured time is only the DECLARE. Re-running a slow query doubles
+# its cost, so it is off by default.
+# ------------------------------------------------------------------------------
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+logger = logging.getLogger("api.slow_queries")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, *labelvalues):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labelvalues, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [per-bucket counts (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labelvalues, (counts, total) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}")
+                lines.append(f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {_number(total)}")
+                lines.append(f"{self.name}_count{_labels(self.labelnames, labelvalues)} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """
+    Gauge whose values are read from a callback when the metrics are rendered; the
+    callback returns {label values: value}.
+    """
+
+    def __init__(self, name, documentation, labelnames, callback):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.callback = callback
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labelvalues, value in sorted(self.callback().items()):
+            lines.append(f"{self.name}{_labels(self.labelnames, labelvalues)} {_number(value)}")
+        return lines
+
+
+REQUEST_DURATION = Histogram("http_request_duration_seconds",
+                             "Time from request start to the end of the response body.",
+                             ("method", "route", "status"))
+STATEMENT_DURATION = Histogram("db_statement_duration_seconds", "SQL statement execution time.",
+                               ("pool", "statement"))
+STATEMENT_ROWS = Counter("db_statement_rows_total", "Rows returned or affected by SQL statements.",
+                         ("pool", "statement"))
+SLOW_QUERIES = Counter("db_slow_queries_total", "Statements slower than the slow-query threshold.",
+                       ("pool", "statement"))
+POOL_WAIT = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.",
+                      ("pool",), buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30))
+POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection.",
+                        ("pool",))
+
+_pools = {}
+
+
+def _pool_values(read):
+    return lambda: {(name,): read(pool) for name, pool in _pools.items()}
+
+
+REGISTRY = [
+    REQUEST_DURATION, STATEMENT_DURATION, STATEMENT_ROWS, SLOW_QUERIES, POOL_WAIT, POOL_TIMEOUTS,
+    Gauge("db_pool_checked_out", "Connections currently checked out of the pool.", ("pool",),
+          _pool_values(lambda pool: pool.checkedout())),
+    Gauge("db_pool_size", "Configured pool size (persistent connections).", ("pool",),
+          _pool_values(lambda pool: pool.size())),
+    Gauge("db_pool_overflow", "Connections open beyond the pool size (negative: unopened pool slots).",
+          ("pool",), _pool_values(lambda pool: pool.overflow())),
+    Gauge("db_pool_saturation", "Checked-out connections / (pool size + max overflow).", ("pool",),
+          _pool_values(lambda pool: pool.checkedout() / (pool.size() + max(pool._max_overflow, 0)))),
+]
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------------------------------------------------------
+# HTTP requests
+# ------------------------------------------------------------------------------
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request. Requests are labelled with the route
+    template (/applications/{app_id}), not the raw path, to keep the series bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.observe(time.perf_counter() - start, scope["method"],
+                                     getattr(route, "path", "<unmatched>"), str(status))
+
+
+# ------------------------------------------------------------------------------
+# Database
+# ------------------------------------------------------------------------------
+STATEMENT_VERB = re.compile(r"^\s*(\w+)")
+STATEMENT_TABLE = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN|VIEW(?: CONCURRENTLY)?)\s+([\w.]+)", re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def statement_label(statement):
+    """Bounded label for a SQL statement: its verb and first table ("SELECT applications")."""
+    verb = STATEMENT_VERB.match(statement)
+    table = STATEMENT_TABLE.search(statement)
+    label = verb.group(1).upper() if verb else "?"
+    return f"{label} {table.group(1)}" if table else label
+
+
+class _TimedCheckout:
+    """Mixin timing QueuePool._do_get(), where a checkout waits for a free connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.inc(1, self.metrics_name)
+            raise
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start, self.metrics_name)
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    metrics_name = "sync"
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    metrics_name = "async"
+
+
+def explain_analyze(connection, statement, parameters):
+    """
+    EXPLAIN ANALYZE plan of a statement the connection just ran. It runs read-only in a
+    savepoint that is always rolled back, so errors and side effects stay out of the
+    caller's transaction.
+    """
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("SAVEPOINT explain_analyze")
+        try:
+            cursor.execute("SET LOCAL transaction_read_only = on")
+            cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+            return "\n".join(row[0] for row in cursor.fetchall())
+        finally:
+            cursor.execute("ROLLBACK TO SAVEPOINT explain_analyze")
+            cursor.execute("RELEASE SAVEPOINT explain_analyze")
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine, slow_query_seconds=None):
+    """
+    Record statement timings and row counts of `engine` (an Engine, or the sync_engine
+    of an AsyncEngine) and report its pool. Create the engine with
+    poolclass=TimedQueuePool (TimedAsyncQueuePool for asyncio) to time checkouts.
+    Statements slower than `slow_query_seconds` are logged, with their EXPLAIN ANALYZE
+    plan for SELECTs (see explain_analyze()); server-side cursor statements are not.
+    """
+    pool_name = getattr(engine.pool, "metrics_name", "default")
+    _pools[pool_name] = engine.pool
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("statement_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def record(connection, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - connection.info["statement_start"].pop()
+        label = statement_label(statement)
+        STATEMENT_DURATION.observe(elapsed, pool_name, label)
+        if cursor.rowcount is not None and cursor.rowcount > 0:
+            STATEMENT_ROWS.inc(cursor.rowcount, pool_name, label)
+        if slow_query_seconds is None or elapsed < slow_query_seconds:
+            return
+        if context is not None and context.execution_options.get("stream_results"):
+            return
+        SLOW_QUERIES.inc(1, pool_name, label)
+        plan = None
+        if not executemany and label.startswith("SELECT"):
+            try:
+                plan = explain_analyze(connection, statement, parameters)
+            except Exception as error:  # best effort; the savepoint leaves the transaction usable
+                plan = f"(EXPLAIN ANALYZE failed: {error})"
+        logger.warning("Slow query (%.3f s): %s\nParameters: %r%s", elapsed, statement, parameters,
+                       f"\n{plan}" if plan else "")
+
+    @event.listens_for(engine, "handle_error")
+    def discard_timer(context):
+        starts = context.connection.info.get("statement_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
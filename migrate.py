@@ -0,0 +1,130 @@
+import re
+import sys
+import time
+import argparse
+
+from sqlalchemy import create_engine, inspect
+
+from API import Base, DATABASE_URL
+
+# ------------------------------------------------------------------------------
+# Schema setup and upgrades.
+#
+#    GooglePlayData.sql is the schema: tables, indexes, statistics views, row
+#    versions. Every step in it is idempotent (IF NOT EXISTS, CREATE OR REPLACE,
+#    DROP ... IF EXISTS), so this command applies all of them to a new or an
+#    existing database and is safe to re-run after each upgrade. Run it once per
+#    deployment, before starting the API workers; the API itself no longer creates
+#    tables on import.
+#
+#    Afterwards the live tables are compared with the ORM models of API.py, so a
+#    column type that drifted between the two is reported instead of surfacing as
+#    an overflow or truncation at request time.
+#
+#    Usage:
+#        python migrate.py                 # apply GooglePlayData.sql, then check
+#        python migrate.py --check         # only compare the database with API.py
+# ------------------------------------------------------------------------------
+SCHEMA_SQL = 'GooglePlayData.sql'
+
+# Steps 1-2 create and connect to the database (psql); the database named by the
+# URL must already exist.
+SKIPPED_STEPS = {1, 2}
+# pg_trgm is a contrib module; without it the API uses its in-memory name index.
+OPTIONAL_STEPS = {9}
+
+STEP_HEADER = re.compile(r'^-- Step (\d+): (.*)$', re.MULTILINE)
+
+# Spellings PostgreSQL reports differently from the ones used in the models
+TYPE_ALIASES = {'FLOAT': 'DOUBLE PRECISION'}
+
+
+def schema_steps(path=SCHEMA_SQL):
+    """
+    Split the schema file into (number, title, SQL) steps at its "-- Step N:" headers.
+    """
+    with open(path, encoding='utf-8') as f:
+        parts = STEP_HEADER.split(f.read())
+    return [(int(parts[i]), parts[i + 1].strip(), parts[i + 2]) for i in range(1, len(parts), 3)]
+
+
+def apply_steps(engine, steps):
+    """
+    Run each step in its own transaction. A failing optional step is reported and
+    skipped; any other failure stops the migration.
+    """
+    for number, title, sql in steps:
+        if number in SKIPPED_STEPS:
+            continue
+        start = time.perf_counter()
+        try:
+            with engine.begin() as connection:
+                # Plain DBAPI cursor: the step is run verbatim, with no parameter
+                # substitution of the '%' characters in it.
+                cursor = connection.connection.dbapi_connection.cursor()
+                try:
+                    cursor.execute(sql)
+                finally:
+                    cursor.close()
+        except Exception as error:
+            if number not in OPTIONAL_STEPS:
+                raise
+            print(f"[Step {number}] {title}: skipped ({str(error).splitlines()[0]})")
+            continue
+        print(f"[Step {number}] {title}: {time.perf_counter() - start:.2f}s")
+
+
+def column_type(type_, dialect):
+    name = type_.compile(dialect=dialect)
+    return TYPE_ALIASES.get(name, name)
+
+
+def schema_drift(engine):
+    """
+    Differences between the ORM models and the database: missing tables and
+    columns, and columns whose types differ. Returns a list of messages.
+    """
+    inspector = inspect(engine)
+    dialect = engine.dialect
+    problems = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"{table.name}: table missing")
+            continue
+        live = {column['name']: column['type'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in live:
+                problems.append(f"{table.name}.{column.name}: column missing")
+                continue
+            expected = column_type(column.type, dialect)
+            actual = column_type(live[column.name], dialect)
+            if expected != actual:
+                problems.append(f"{table.name}.{column.name}: database has {actual}, API.py expects {expected}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create or upgrade the database schema.")
+    parser.add_argument('--database-url', default=DATABASE_URL)
+    parser.add_argument('--schema', default=SCHEMA_SQL, help="Schema file to apply")
+    parser.add_argument('--check', action='store_true',
+                        help="Only compare the database with the ORM models, change nothing")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    try:
+        if not args.check:
+            apply_steps(engine, schema_steps(args.schema))
+        problems = schema_drift(engine)
+    finally:
+        engine.dispose()
+
+    for problem in problems:
+        print(f"Schema drift: {problem}")
+    if problems:
+        sys.exit(1)
+    print("Schema matches API.py")
+
+
+if __name__ == "__main__":
+    main()
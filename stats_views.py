@@ -0,0 +1,29 @@
+import time
+
+from sqlalchemy import text
+
+# ------------------------------------------------------------------------------
+# Materialized views behind the /stats/... API endpoints (see GooglePlayData.sql,
+# Step 8). Shared by API.py (refresh on demand) and load_data.py (refresh after
+# every load).
+# ------------------------------------------------------------------------------
+STATS_VIEWS = ['mv_category_stats', 'mv_release_trend', 'mv_update_trend', 'mv_paid_price_counts']
+
+
+def refresh_stats(connection, concurrently=True):
+    """
+    Refresh every statistics view that exists in the database and return the time
+    each refresh took, in seconds. Views missing from an older schema are skipped.
+
+    CONCURRENTLY rebuilds a view without locking out readers (it needs the view's
+    unique index); pass concurrently=False for a faster refresh when nobody is reading.
+    """
+    timings = {}
+    mode = 'CONCURRENTLY ' if concurrently else ''
+    for view in STATS_VIEWS:
+        if connection.execute(text("SELECT to_regclass(:view)"), {'view': view}).scalar() is None:
+            continue
+        start = time.perf_counter()
+        connection.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{view}"))
+        timings[view] = round(time.perf_counter() - start, 3)
+    return timings
@@ -0,0 +1,133 @@
+import re
+
+import numpy as np
+
+# ------------------------------------------------------------------------------
+# In-memory trigram index for fuzzy app-name search.
+#
+# Fallback for databases without the pg_trgm extension, following its rules so
+# both paths rank names the same way:
+#   - text is lower-cased and split into words (runs of letters and digits),
+#   - each word is padded with two spaces in front and one behind, and every
+#     3-character window of the padded word is a trigram,
+#   - similarity = shared trigrams / trigrams in either string.
+# A name matches a query when the similarity reaches the threshold (pg_trgm's `%`)
+# or when it contains the query case-insensitively (ILIKE '%query%').
+#
+# Postings are stored as one NumPy array of document numbers sorted by trigram
+# (plus an offset per trigram), about 4 bytes per trigram occurrence. The lower-cased
+# texts are kept in a NumPy string array, so substring checks (including queries too
+# short to have trigrams) run as one vectorized scan, and results are ranked by
+# partial selection rather than by sorting every match.
+# ------------------------------------------------------------------------------
+WORD = re.compile(r'[^\W_]+')
+
+
+def trigrams(text):
+    """
+    Return the set of trigrams of `text`, as pg_trgm's show_trgm() would.
+    """
+    grams = set()
+    for word in WORD.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def similarity(a, b):
+    """
+    Trigram similarity of two strings, between 0 and 1 (pg_trgm's similarity()).
+    """
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    union = len(grams_a | grams_b)
+    return len(grams_a & grams_b) / union if union else 0.0
+
+
+class TrigramIndex:
+    """
+    Inverted trigram index over a list of texts, each identified by a key.
+    """
+
+    def __init__(self, keys, texts):
+        self.keys = list(keys)
+        self.texts = list(texts)
+        self._lowered = np.array([(text or '').lower() for text in self.texts], dtype=np.dtypes.StringDType())
+        # Position of each key in key order, to break score ties without comparing strings
+        self._key_rank = np.empty(len(self.keys), dtype=np.int64)
+        self._key_rank[sorted(range(len(self.keys)), key=self.keys.__getitem__)] = np.arange(len(self.keys))
+        self._vocabulary = {}
+        gram_ids = []
+        doc_ids = []
+        self._sizes = np.zeros(len(self.texts), dtype=np.int32)
+        for doc, text in enumerate(self.texts):
+            grams = trigrams(text or '')
+            self._sizes[doc] = len(grams)
+            for gram in grams:
+                gram_ids.append(self._vocabulary.setdefault(gram, len(self._vocabulary)))
+                doc_ids.append(doc)
+        gram_ids = np.array(gram_ids, dtype=np.int64)
+        self._postings = np.array(doc_ids, dtype=np.int32)[np.argsort(gram_ids, kind='stable')]
+        counts = np.bincount(gram_ids, minlength=len(self._vocabulary))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def __len__(self):
+        return len(self.texts)
+
+    def _documents(self, gram):
+        gram_id = self._vocabulary.get(gram)
+        if gram_id is None:
+            return self._postings[:0]
+        return self._postings[self._offsets[gram_id]:self._offsets[gram_id + 1]]
+
+    def _count(self, grams):
+        """Number of the given trigrams each document contains."""
+        postings = [self._documents(gram) for gram in grams]
+        if not postings:
+            return np.zeros(len(self.texts), dtype=np.int64)
+        return np.bincount(np.concatenate(postings), minlength=len(self.texts))
+
+    def _substring_matches(self, query):
+        """
+        Documents containing `query` case-insensitively. Only documents that have every
+        unpadded trigram of the query's longer words are checked, since any text that
+        contains the query contains those; queries without such words are scanned.
+        """
+        needle = query.lower()
+        required = {word[i:i + 3] for word in WORD.findall(needle) for i in range(len(word) - 2)}
+        if not required:
+            return np.flatnonzero(np.strings.find(self._lowered, needle) >= 0)
+        candidates = np.flatnonzero(self._count(required) == len(required))
+        return candidates[np.strings.find(self._lowered[candidates], needle) >= 0]
+
+    def _top(self, docs, scores, limit):
+        """
+        The `limit` best of `docs` in rank order: highest score first, ties in key order.
+        Selects with np.partition / np.argpartition in O(len(docs)) and only sorts the
+        selected documents.
+        """
+        if len(docs) > limit:
+            doc_scores = scores[docs]
+            cutoff = np.partition(doc_scores, len(docs) - limit)[len(docs) - limit]
+            above = docs[doc_scores > cutoff]
+            tied = docs[doc_scores == cutoff]
+            missing = limit - len(above)
+            if len(tied) > missing:
+                tied = tied[np.argpartition(self._key_rank[tied], missing - 1)[:missing]]
+            docs = np.concatenate([above, tied])
+        return docs[np.lexsort((self._key_rank[docs], -scores[docs]))]
+
+    def search(self, query, limit=20, threshold=0.3):
+        """
+        Return up to `limit` (key, text, similarity) tuples for the documents similar
+        to or containing `query`, best match first (ties in key order).
+        """
+        grams = trigrams(query)
+        shared = self._count(grams)
+        union = len(grams) + self._sizes - shared
+        scores = np.divide(shared, union, out=np.zeros(len(self.texts)), where=union > 0)
+        matched = scores >= threshold
+        matched[self._substring_matches(query)] = True
+        matches = np.flatnonzero(matched)
+        if limit <= 0:
+            return []
+        return [(self.keys[doc], self.texts[doc], float(scores[doc])) for doc in self._top(matches, scores, limit)]